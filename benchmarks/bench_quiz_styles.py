@@ -0,0 +1,115 @@
+# benchmarks/bench_quiz_styles.py
+"""
+Mide el costo de redibujar una pregunta del quiz con dos estrategias de estilos:
+
+  antes:   setStyleSheet por widget en cada pregunta (como hacía QuizApp antes).
+  después: propiedades dinámicas sobre QUIZ_STYLESHEET + unpolish/polish.
+
+Cada ciclo reproduce una pregunta completa: mostrar el texto, habilitar las 4 opciones,
+resaltar la respuesta y pintar la vista de forma síncrona (repaint).
+
+Uso:  python benchmarks/bench_quiz_styles.py [--iterations 300]
+      (sin pantalla: QT_QPA_PLATFORM=offscreen python benchmarks/bench_quiz_styles.py)
+"""
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtWidgets import QApplication
+from gui.quiz_app import QuizApp
+
+# Hojas de estilo que QuizApp aplicaba widget por widget en cada pregunta
+LEGACY_QUESTION_STYLE = "font-size: 24px; margin: 20px 0; padding: 15px; background-color: #444444; color: white; border-radius: 5px;"
+LEGACY_DEFAULT_BUTTON_STYLE = """
+            QPushButton {
+                padding: 12px;
+                font-size: 16px;
+                border: none;
+                border-radius: 4px;
+                background-color: #555555;
+                color: white;
+            }
+            QPushButton:hover {
+                background-color: #666666;
+            }
+        """
+LEGACY_CORRECT_STYLE = "background-color: #28a745; color: white; padding: 12px; font-size: 16px; border-radius: 4px;"
+LEGACY_WRONG_STYLE = "background-color: #dc3545; color: white; padding: 12px; font-size: 16px; border-radius: 4px;"
+
+OPTIONS = ["Maradona", "Pelé", "Cruyff", "Beckenbauer"]
+
+
+def legacy_cycle(view: QuizApp, number: int):
+    view.question_label.setText(f"Pregunta {number}: ¿Quién ganó el Mundial {number}?")
+    view.question_label.setStyleSheet(LEGACY_QUESTION_STYLE)
+    for btn, option in zip(view.option_buttons, OPTIONS):
+        btn.setText(option)
+        btn.setStyleSheet(LEGACY_DEFAULT_BUTTON_STYLE)
+    for btn in view.option_buttons:  # toggle_options(True)
+        btn.setEnabled(True)
+        btn.setStyleSheet(LEGACY_DEFAULT_BUTTON_STYLE)
+    for btn in view.option_buttons:  # toggle_options(False)
+        btn.setEnabled(False)
+    for btn in view.option_buttons:  # highlight_answer
+        if btn.text() == OPTIONS[0]:
+            btn.setStyleSheet(LEGACY_CORRECT_STYLE)
+        elif btn.text() == OPTIONS[1]:
+            btn.setStyleSheet(LEGACY_WRONG_STYLE)
+        else:
+            btn.setStyleSheet(LEGACY_DEFAULT_BUTTON_STYLE)
+    view.repaint()
+
+
+def property_cycle(view: QuizApp, number: int):
+    view.question_label.setText(f"Pregunta {number}: ¿Quién ganó el Mundial {number}?")
+    view._set_style_state(view.question_label, 'state', "question")
+    for btn, option in zip(view.option_buttons, OPTIONS):
+        btn.setText(option)
+        view._set_default_button_style(btn)
+    view.toggle_options(True)
+    view.toggle_options(False)
+    view.highlight_answer(1, 0)  # Elegida: OPTIONS[1], correcta: OPTIONS[0]
+    view.repaint()
+
+
+def measure(cycle, view: QuizApp, iterations: int) -> list:
+    for i in range(20):  # Calentamiento
+        cycle(view, i)
+    timings = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        cycle(view, i)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=300)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    results = {}
+    for name, cycle in (("antes (setStyleSheet)", legacy_cycle), ("después (propiedades)", property_cycle)):
+        view = QuizApp(quiz_generator=None)
+        view.resize(850, 650)
+        view.show()
+        app.processEvents()
+        results[name] = measure(cycle, view, args.iterations)
+        view.close()
+        view.deleteLater()
+        app.processEvents()
+
+    print(f"Redibujo por pregunta ({args.iterations} iteraciones):")
+    for name, timings in results.items():
+        print(f"  {name:<24} media {statistics.mean(timings):7.3f} ms | "
+              f"mediana {statistics.median(timings):7.3f} ms | p95 {sorted(timings)[int(len(timings) * 0.95)]:7.3f} ms")
+
+
+if __name__ == '__main__':
+    main()
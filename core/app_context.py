@@ -0,0 +1,96 @@
+# core/app_context.py
+
+import os
+import time
+import threading
+import logging
+
+from core.database_manager import DatabaseManager, DATABASE_FILE, DATA_DIR
+from logic.data_analyzer import DataAnalyzer
+from logic.quiz_generator import QuizGenerator
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def log_load_report(load_report: dict):
+    """Muestra filas y tiempos de parseo/escritura de cada tabla, de la más lenta a la más rápida."""
+    ordered = sorted(load_report.items(),
+                     key=lambda item: item[1]['parse_seconds'] + item[1]['write_seconds'], reverse=True)
+    for table_name, stats in ordered:
+        if stats['error']:
+            logger.error(f"  {table_name:<18} ERROR: {stats['error']}")
+            continue
+        logger.info(
+            f"  {table_name:<18} {stats['rows']:>10,} filas ({stats['mode']}) | "
+            f"parseo {stats['parse_seconds']:6.2f} s | escritura {stats['write_seconds']:6.2f} s"
+        )
+
+
+class AppContext:
+    """
+    Contenedor de servicios de la aplicación: un único DatabaseManager (pooled),
+    el DataAnalyzer y el QuizGenerator que lo comparten. Se crea una vez en main.py
+    y se pasa a MainWindow; así la DB se inicializa una sola vez y las conexiones
+    persistentes y los cachés sirven para toda la app.
+    """
+
+    def __init__(self, db_path=DATABASE_FILE, data_dir=DATA_DIR):
+        self.db_manager = DatabaseManager(db_path=db_path, data_dir=data_dir, pooled=True)
+        self._analyzer = None
+        self._quiz_generator = None
+        self._database_ready = False
+        # Los servicios se pueden pedir desde el hilo de la GUI o desde el QThreadPool
+        self._lock = threading.RLock()
+
+    @property
+    def database_ready(self) -> bool:
+        return self._database_ready
+
+    def initialize_database(self) -> dict:
+        """
+        Ejecuta initialize_database() una sola vez por sesión, registra su reporte de carga
+        por tabla y lo devuelve. Pensado para el QThreadPool (ver warm_up).
+        """
+        with self._lock:
+            if self._database_ready:
+                return {}
+            db_exists_before = os.path.exists(self.db_manager.db_path)
+            start_time = time.time()
+            load_report = self.db_manager.initialize_database()
+            self._database_ready = True
+
+        # Desglose por tabla para ver qué dataset demora el aprovisionamiento
+        if load_report:
+            log_load_report(load_report)
+            phase = "Carga inicial" if not db_exists_before else "Refresco incremental"
+            failed = [table_name for table_name, stats in load_report.items() if stats['error']]
+            if failed:
+                logger.error(f"{phase} de datos con errores en: {', '.join(failed)}.")
+            logger.info(f"{phase} de datos tomó {time.time() - start_time:.2f} segundos en total.")
+        else:
+            logger.info("Base de datos ya existente y sin cambios en los archivos de datos.")
+        return load_report
+
+    @property
+    def analyzer(self) -> DataAnalyzer:
+        with self._lock:
+            if self._analyzer is None:
+                self._analyzer = DataAnalyzer(db_manager=self.db_manager)
+            return self._analyzer
+
+    @property
+    def quiz_generator(self) -> QuizGenerator:
+        with self._lock:
+            if self._quiz_generator is None:
+                self._quiz_generator = QuizGenerator(db_manager=self.db_manager, analyzer=self.analyzer)
+            return self._quiz_generator
+
+    def warm_up(self) -> QuizGenerator:
+        """Deja la DB lista y construye el banco de preguntas y el DataAnalyzer (pensado para el QThreadPool)."""
+        self.initialize_database()
+        return self.quiz_generator
+
+    def close(self):
+        """Cierra las conexiones persistentes del DatabaseManager compartido."""
+        self.db_manager.close()
@@ -3,7 +3,15 @@
 import sqlite3
 import pandas as pd
 import os
+import time
+import queue
+import hashlib
 import logging
+import weakref
+import threading
+import multiprocessing
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
@@ -16,6 +24,311 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATABASE_FILE = os.path.join(BASE_DIR, 'futbolmania.db')
 DATA_DIR = os.path.join(BASE_DIR, 'data')
 
+# ----------------------------------------------------------------------
+# CONFIGURACIÓN DE DATASETS (tabla SQLite -> archivo CSV en DATA_DIR)
+# ----------------------------------------------------------------------
+DATASETS = {
+    'quiz_questions': 'preguntas.csv',
+    'world_cups': 'WorldCups.csv',
+    'ucl_performance': 'UCL_AllTime_Performance_Table.csv',
+    'appearances': 'appearances.csv',
+    'players': 'players.csv',
+    'clubs': 'clubs.csv',
+    'ballon_dor': 'ballon_dor.csv',
+}
+
+# Archivos a los que solo se les agregan filas al final (ej. una nueva temporada):
+# si el contenido anterior no cambió, se carga únicamente el delta.
+APPEND_ONLY_DATASETS = {'appearances'}
+
+# Tablas que un refresco de datos NUNCA debe tocar
+PROTECTED_TABLES = {'Ranking', 'dataset_manifest'}
+
+# Una recarga completa escribe en '<tabla>__staging' y solo al terminar bien reemplaza a la tabla
+STAGING_SUFFIX = '__staging'
+
+# Índices creados DESPUÉS de la carga masiva: (nombre, tabla, columnas)
+INDEX_DEFINITIONS = [
+    ('idx_appearances_player', 'appearances', ('player_id',)),
+    ('idx_appearances_club', 'appearances', ('player_club_id',)),
+    ('idx_appearances_date', 'appearances', ('date',)),
+    ('idx_players_player_id', 'players', ('player_id',)),
+    ('idx_clubs_club_id', 'clubs', ('club_id',)),
+    ('idx_clubs_competition_season', 'clubs', ('domestic_competition_id', 'last_season')),
+    ('idx_ballon_dor_year', 'ballon_dor', ('Year',)),
+    ('idx_quiz_questions_type', 'quiz_questions', ('Type',)),
+]
+
+# ----------------------------------------------------------------------
+# ESTADÍSTICAS PRE-AGREGADAS POR JUGADOR Y TEMPORADA (player_season_stats)
+# ----------------------------------------------------------------------
+# Tablas de origen: si se recarga alguna, la tabla derivada se reconstruye
+PLAYER_SEASON_STATS_SOURCES = ('appearances', 'players', 'clubs')
+# Columnas de 'appearances' que se suman por jugador/club/competición/temporada
+PLAYER_SEASON_STATS_SUMS = ('goals', 'assists', 'minutes_played', 'yellow_cards', 'red_cards')
+# La temporada empieza en julio: un partido de 2024-03 pertenece a la temporada 2023 (2023/24)
+SEASON_START_MONTH = 7
+SEASON_SQL = (f"CAST(SUBSTR(date, 1, 4) AS INTEGER) - "
+              f"(CAST(SUBSTR(date, 6, 2) AS INTEGER) < {SEASON_START_MONTH})")
+PLAYER_SEASON_STATS_INDEXES = [
+    ('idx_pss_competition_season_goals', ('competition_id', 'season', 'goals')),
+    ('idx_pss_competition_season_assists', ('competition_id', 'season', 'assists')),
+    ('idx_pss_player', ('player_id',)),
+]
+
+# Filas por bloque al leer los CSV (acota la memoria en 'appearances')
+CSV_CHUNK_SIZE = 100_000
+
+# Bloques en vuelo entre los procesos de parseo y el escritor (contrapresión)
+LOAD_QUEUE_SIZE = 16
+
+# Los workers de parseo se lanzan con 'spawn', nunca con fork: la carga corre en un hilo del
+# QThreadPool y hacer fork de un proceso con hilos (Qt, ScoreWriter) puede dejar locks tomados
+PARSE_START_METHOD = 'spawn'
+
+# Tamaño por defecto del leaderboard materializado (RankingLeaderboard)
+LEADERBOARD_SIZE = 100
+
+# Ventanas de tiempo y criterios de orden admitidos por fetch_leaderboard
+LEADERBOARD_PERIODS = ('today', 'week', 'all')
+LEADERBOARD_ORDERS = {'score': 'score', 'ratio': 'score_ratio'}
+
+# Conexiones persistentes de hilos terminados que se conservan para reutilizar (el resto se cierra)
+POOL_MAX_IDLE = 4
+
+# Pragmas aplicados UNA vez a cada conexión persistente del modo pooled
+POOLED_PRAGMAS = (
+    "PRAGMA journal_mode=WAL;",
+    "PRAGMA synchronous=NORMAL;",      # Seguro con WAL y sin fsync por cada commit
+    "PRAGMA cache_size=-20000;",       # ~20 MB de caché de páginas
+    "PRAGMA mmap_size=268435456;",     # 256 MB mapeados en memoria
+    "PRAGMA temp_store=MEMORY;",
+    "PRAGMA busy_timeout=5000;",
+)
+
+# ----------------------------------------------------------------------
+# PARSEO DE CSV EN PROCESOS (un archivo por worker, un único escritor)
+# ----------------------------------------------------------------------
+_load_queue = None
+
+
+def _sqlite_type(dtype) -> str:
+    """Traduce el dtype de pandas al tipo de columna de SQLite."""
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(dtype):
+        return "REAL"
+    return "TEXT"
+
+
+def _chunk_rows(chunk: pd.DataFrame) -> list:
+    """Convierte un bloque a tuplas de tipos nativos de Python (NaN -> NULL) para executemany."""
+    # Conversión por columna: solo las columnas con nulos pasan por object
+    columns = [
+        (series.astype(object).where(series.notna(), None) if series.hasnans else series).tolist()
+        for _, series in chunk.items()
+    ]
+    return list(zip(*columns))
+
+
+def _init_parse_worker(load_queue):
+    """Inicializador del pool: la cola se hereda al crear el proceso (no se puede pasar por submit)."""
+    global _load_queue
+    _load_queue = load_queue
+
+
+def _parse_csv_worker(table_name: str, csv_path: str, start_offset: int = 0, chunk_size: int = CSV_CHUNK_SIZE):
+    """
+    Lee un CSV por bloques y envía al escritor mensajes (tipo, tabla, carga):
+    'schema' con las columnas, 'rows' por cada bloque y 'done' con los segundos de parseo.
+    Con start_offset > 0 solo se leen las filas agregadas desde ese byte (carga delta).
+    """
+    start_time = time.perf_counter()
+    try:
+        append = start_offset > 0
+        if append:
+            header = pd.read_csv(csv_path, nrows=0).columns.tolist()
+            csv_file = open(csv_path, 'rb')
+            csv_file.seek(start_offset)
+            reader = pd.read_csv(csv_file, header=None, names=header, chunksize=chunk_size, low_memory=False)
+        else:
+            csv_file = None
+            reader = pd.read_csv(csv_path, chunksize=chunk_size, low_memory=False)
+
+        try:
+            schema_sent = False
+            for chunk in reader:
+                if not schema_sent:
+                    columns = [(col, _sqlite_type(dtype)) for col, dtype in chunk.dtypes.items()]
+                    _load_queue.put(('schema', table_name, (columns, append)))
+                    schema_sent = True
+                _load_queue.put(('rows', table_name, _chunk_rows(chunk)))
+        finally:
+            if csv_file:
+                csv_file.close()
+        _load_queue.put(('done', table_name, time.perf_counter() - start_time))
+    except Exception as e:
+        _load_queue.put(('error', table_name, str(e)))
+
+
+def _file_fingerprint(path: str, prefix_size: int = None) -> dict:
+    """
+    Tamaño, mtime y SHA-256 del archivo. Si se indica prefix_size, en la misma pasada
+    calcula el hash de los primeros prefix_size bytes (para detectar un archivo solo ampliado).
+    """
+    stat = os.stat(path)
+    digest = hashlib.sha256()
+    prefix_digest = None
+    prefix_ends_with_newline = False
+    read_bytes = 0
+    last_byte = b''
+
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            if prefix_size is not None and prefix_digest is None and read_bytes + len(block) >= prefix_size:
+                cut = prefix_size - read_bytes
+                digest.update(block[:cut])
+                # hexdigest() no finaliza el hash: se puede seguir actualizando con el resto
+                prefix_digest = digest.hexdigest()
+                prefix_ends_with_newline = (block[cut - 1:cut] if cut > 0 else last_byte) == b'\n'
+                digest.update(block[cut:])
+            else:
+                digest.update(block)
+            read_bytes += len(block)
+            last_byte = block[-1:]
+
+    return {
+        'file_size': stat.st_size,
+        'file_mtime': stat.st_mtime,
+        'sha256': digest.hexdigest(),
+        'prefix_sha256': prefix_digest,
+        'prefix_ends_with_newline': prefix_ends_with_newline,
+    }
+
+
+class _ThreadConnection:
+    """Contenedor de la conexión persistente de un hilo (guardado en threading.local)."""
+    __slots__ = ('conn', '__weakref__')
+
+    def __init__(self, conn):
+        self.conn = conn
+
+
+def _release_pooled_connection(conn, pool: list, idle: list, pool_lock):
+    """
+    Finalizador del holder de un hilo que terminó: la conexión vuelve a las ociosas
+    (hasta POOL_MAX_IDLE) para el próximo hilo, o se cierra. Si close() ya la cerró, no hace nada.
+    """
+    with pool_lock:
+        if conn not in pool:
+            return
+        if len(idle) < POOL_MAX_IDLE:
+            if conn.in_transaction:
+                conn.rollback()
+            idle.append(conn)
+            return
+        pool.remove(conn)
+    try:
+        conn.close()
+    except sqlite3.Error as e:
+        logger.error(f"Error al cerrar una conexión persistente: {e}")
+
+
+# ----------------------------------------------------------------------
+# MIGRACIONES DE ESQUEMA (PRAGMA user_version)
+# Cada función lleva el esquema de la versión i a la i+1; se ejecutan UNA vez.
+# ----------------------------------------------------------------------
+
+def _migration_001_ranking_table(conn):
+    """Crea la tabla Ranking, o le agrega 'player_name' si viene de una versión anterior."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS Ranking (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            player_name TEXT NOT NULL,
+            score INTEGER NOT NULL,
+            total_questions INTEGER NOT NULL,
+            game_mode TEXT NOT NULL,
+            date_played TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(Ranking);")}
+    if 'player_name' not in columns:
+        conn.execute("ALTER TABLE Ranking ADD COLUMN player_name TEXT NOT NULL DEFAULT 'Anónimo';")
+        logger.info("Columna 'player_name' añadida a la tabla Ranking.")
+
+
+def _migration_002_ranking_covering_index(conn):
+    """Índice que cubre fetch_top_scores: el top se lee en orden sin escanear ni ordenar la tabla."""
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_ranking_score_date
+        ON Ranking (score DESC, date_played DESC, player_name, total_questions, game_mode)
+    """)
+
+
+def _migration_003_app_settings(conn):
+    """Tabla clave/valor para opciones persistentes de la base (ej. tamaño del leaderboard)."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS app_settings (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        )
+    """)
+
+
+def _migration_004_leaderboard_keyset_indexes(conn):
+    """
+    Columna virtual score_ratio (score/total_questions) e índices para fetch_leaderboard:
+    cada orden (puntaje o ratio), con o sin filtro de modo, termina en (date_played, id)
+    para que el cursor keyset sea una búsqueda por rango en el índice.
+    """
+    columns = {row[1] for row in conn.execute("PRAGMA table_xinfo(Ranking);")}
+    if 'score_ratio' not in columns:
+        conn.execute("""
+            ALTER TABLE Ranking ADD COLUMN score_ratio REAL
+            GENERATED ALWAYS AS (CAST(score AS REAL) / total_questions) VIRTUAL
+        """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_ranking_score_keyset ON Ranking (score DESC, date_played DESC, id DESC)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_ranking_mode_score ON Ranking (game_mode, score DESC, date_played DESC, id DESC)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_ranking_ratio ON Ranking (score_ratio DESC, date_played DESC, id DESC)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_ranking_mode_ratio ON Ranking (game_mode, score_ratio DESC, date_played DESC, id DESC)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_ranking_date ON Ranking (date_played)")
+
+
+def _migration_005_ranking_submission_id(conn):
+    """Identificador de envío único: reintentar un lote ya confirmado no duplica puntajes."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_xinfo(Ranking);")}
+    if 'submission_id' not in columns:
+        conn.execute("ALTER TABLE Ranking ADD COLUMN submission_id TEXT")
+    conn.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_ranking_submission
+        ON Ranking (submission_id) WHERE submission_id IS NOT NULL
+    """)
+
+
+def _migration_006_merge_ranking_score_indexes(conn):
+    """
+    Un solo índice para el orden por puntaje: el cubriente de fetch_top_scores pasa a incluir 'id'
+    tras (score, date_played) y reemplaza a idx_ranking_score_keyset (mismo prefijo, un índice
+    menos que mantener en cada INSERT de Ranking).
+    """
+    conn.execute("DROP INDEX IF EXISTS idx_ranking_score_date")
+    conn.execute("DROP INDEX IF EXISTS idx_ranking_score_keyset")
+    conn.execute("""
+        CREATE INDEX IF NOT EXISTS idx_ranking_score_covering
+        ON Ranking (score DESC, date_played DESC, id DESC, player_name, total_questions, game_mode)
+    """)
+
+
+SCHEMA_MIGRATIONS = [
+    _migration_001_ranking_table,
+    _migration_002_ranking_covering_index,
+    _migration_003_app_settings,
+    _migration_004_leaderboard_keyset_indexes,
+    _migration_005_ranking_submission_id,
+    _migration_006_merge_ranking_score_indexes,
+]
+
+
 # ----------------------------------------------------------------------
 # CLASE DATABASE MANAGER
 # ----------------------------------------------------------------------
@@ -25,13 +338,41 @@ class DatabaseManager:
     Clase para gestionar la conexión, la carga inicial de datos 
     y la persistencia (guardado de Ranking) en SQLite.
     """
-    def __init__(self, db_path=DATABASE_FILE, data_dir=DATA_DIR):
+    def __init__(self, db_path=DATABASE_FILE, data_dir=DATA_DIR, pooled: bool = False):
         self.db_path = db_path
         self.data_dir = data_dir
 
+        # Modo pooled: una conexión persistente por hilo, reutilizada entre llamadas
+        self.pooled = pooled
+        self._local = threading.local()
+        self._pool = []   # Todas las conexiones abiertas (en uso u ociosas)
+        self._idle = []   # Conexiones de hilos que ya terminaron, listas para reutilizar
+        # Reentrante: un finalizador puede correr (vía gc) en un hilo que ya tiene el lock
+        self._pool_lock = threading.RLock()
+
+        # Tamaño del leaderboard materializado (None = sin leaderboard), leído una vez de app_settings
+        self._leaderboard_size = None
+        self._leaderboard_size_loaded = False
+
     @contextmanager
-    def connect(self):
-        """Context Manager para manejar la conexión a SQLite de forma segura."""
+    def connect(self, dedicated: bool = False):
+        """
+        Context Manager para manejar la conexión a SQLite de forma segura.
+        En modo pooled entrega la conexión persistente del hilo actual (salvo dedicated=True).
+        """
+        if self.pooled and not dedicated:
+            conn = None
+            try:
+                conn = self._thread_connection()
+                yield conn
+            except sqlite3.Error as e:
+                logger.error(f"Error de conexión a la base de datos: {e}")
+            finally:
+                # Igual que al cerrar una conexión: lo no confirmado se descarta
+                if conn is not None and conn.in_transaction:
+                    conn.rollback()
+            return
+
         conn = None
         try:
             conn = sqlite3.connect(self.db_path)
@@ -44,6 +385,43 @@ class DatabaseManager:
         finally:
             if conn:
                 conn.close()
+
+    def _thread_connection(self):
+        """Devuelve la conexión persistente del hilo actual (reutiliza una ociosa o abre una nueva)."""
+        holder = getattr(self._local, 'holder', None)
+        if holder is None:
+            with self._pool_lock:
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                # check_same_thread=False: al terminar un hilo su conexión pasa a otro (o se cierra desde close())
+                conn = sqlite3.connect(self.db_path, check_same_thread=False)
+                conn.row_factory = sqlite3.Row
+                for pragma in POOLED_PRAGMAS:
+                    conn.execute(pragma)
+                with self._pool_lock:
+                    self._pool.append(conn)
+                logger.debug(f"Conexión persistente abierta para el hilo {threading.current_thread().name}.")
+            holder = _ThreadConnection(conn)
+            # Cuando el hilo termina (ej. un worker del QThreadPool que expira) se libera su estado local
+            # y con él el holder: la conexión se devuelve a las ociosas o se cierra (el pool no crece sin límite)
+            weakref.finalize(holder, _release_pooled_connection, conn, self._pool, self._idle, self._pool_lock)
+            self._local.holder = holder
+        return holder.conn
+
+    def close(self):
+        """Cierra todas las conexiones persistentes del modo pooled (llamar al salir de la app)."""
+        with self._pool_lock:
+            connections = list(self._pool)
+            self._pool.clear()
+            self._idle.clear()
+            self._local = threading.local()
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.error(f"Error al cerrar una conexión persistente: {e}")
+        if connections:
+            logger.info(f"{len(connections)} conexiones persistentes cerradas.")
     
     def query(self, sql_query, params=None):
         """
@@ -60,37 +438,24 @@ class DatabaseManager:
 
     #  LÓGICA DE PERSISTENCIA Y RANKING  
     
-    def _create_ranking_table(self):
-        """Crea la tabla Ranking si no existe (AÑADIDA COLUMNA player_name)."""
+    def migrate_schema(self):
+        """
+        Aplica las migraciones pendientes según PRAGMA user_version, cada una en su transacción.
+        Se llama una vez desde initialize_database; las rutas de ranking ya no verifican el esquema.
+        """
         with self.connect() as conn:
-            if conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS Ranking (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        player_name TEXT NOT NULL,  -- <<-- ¡CORREGIDO!
-                        score INTEGER NOT NULL,
-                        total_questions INTEGER NOT NULL,
-                        game_mode TEXT NOT NULL,
-                        date_played TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-                
-                #  Si la tabla ya existe y le falta la columna 'player_name', la añadimos.
-                try:
-                    cursor.execute("ALTER TABLE Ranking ADD COLUMN player_name TEXT NOT NULL DEFAULT 'Anónimo';")
-                    logger.info("Columna 'player_name' añadida a la tabla Ranking.")
-                except sqlite3.OperationalError as e:
-                    if 'duplicate column name' in str(e):
-                        pass # La columna ya existe, no hacemos nada.
-                    else:
-                        logger.error(f"Error al intentar añadir columna a Ranking: {e}")
-                        
+            if not conn:
+                return
+            version = conn.execute("PRAGMA user_version;").fetchone()[0]
+            for target_version, migration in enumerate(SCHEMA_MIGRATIONS[version:], start=version + 1):
+                conn.execute("BEGIN;")
+                migration(conn)
+                conn.execute(f"PRAGMA user_version={target_version};")
                 conn.commit()
+                logger.info(f"Esquema migrado a la versión {target_version} ({migration.__name__}).")
 
     def save_score(self, player_name: str, score: int, total_questions: int, game_mode: str = "TriviaClasica"):
-        """Guarda un puntaje en la base de datos (AÑADIDO player_name)."""
-        self._create_ranking_table() # Asegura que la tabla exista antes de insertar
+        """Guarda un puntaje en la base de datos (el esquema lo garantiza migrate_schema)."""
         
         # Saneamiento básico del nombre
         player_name = player_name.strip() if player_name else "Anónimo"
@@ -104,40 +469,627 @@ class DatabaseManager:
                 """, (player_name, score, total_questions, game_mode))
                 conn.commit()
                 
+    def save_scores(self, scores: list):
+        """
+        Guarda varios puntajes en UNA transacción. Cada puntaje es un dict con
+        submission_id, player_name, score, total_questions y game_mode; un submission_id
+        ya guardado se ignora. A diferencia de save_score, propaga sqlite3.Error
+        (ej. 'database is locked') para que quien llama pueda reintentar.
+        """
+        rows = [
+            (item['submission_id'], (item['player_name'] or "").strip() or "Anónimo",
+             item['score'], item['total_questions'], item['game_mode'])
+            for item in scores
+        ]
+        error = None
+        with self.connect() as conn:
+            if not conn:
+                raise sqlite3.OperationalError("No se pudo abrir la base de datos.")
+            try:
+                conn.executemany("""
+                    INSERT OR IGNORE INTO Ranking (submission_id, player_name, score, total_questions, game_mode)
+                    VALUES (?, ?, ?, ?, ?)
+                """, rows)
+                conn.commit()
+            except sqlite3.Error as e:
+                conn.rollback()
+                error = e
+        if error:
+            raise error
+
     def fetch_top_scores(self, limit: int = 10) -> pd.DataFrame:
-        """Obtiene los mejores puntajes del ranking (AÑADIDO player_name)."""
-        self._create_ranking_table() # Asegura que la tabla exista antes de consultar
-        sql = """
-            SELECT player_name, score, total_questions, game_mode, date_played 
-            FROM Ranking 
-            ORDER BY score DESC, date_played DESC 
-            LIMIT ?
         """
+        Obtiene los mejores puntajes del ranking. Si el leaderboard materializado está
+        activo y alcanza para 'limit', se lee de él (costo constante); si no, del índice cubriente.
+        """
+        leaderboard_size = self.get_leaderboard_size()
+        if leaderboard_size and limit <= leaderboard_size:
+            sql = """
+                SELECT player_name, score, total_questions, game_mode, date_played 
+                FROM RankingLeaderboard 
+                ORDER BY score DESC, date_played DESC, id DESC 
+                LIMIT ?
+            """
+        else:
+            sql = """
+                SELECT player_name, score, total_questions, game_mode, date_played 
+                FROM Ranking 
+                ORDER BY score DESC, date_played DESC, id DESC 
+                LIMIT ?
+            """
         # Usamos el método 'query' ya definido para obtener un DataFrame
         return self.query(sql, params=(limit,))
 
+    #  LEADERBOARD PAGINADO (filtros por modo, período y ratio; cursores keyset)
+
+    @staticmethod
+    def _period_start(period: str):
+        """Inicio (UTC, mismo formato que CURRENT_TIMESTAMP) de la ventana 'today' o 'week'."""
+        now = datetime.now().astimezone()
+        if period == 'today':
+            start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        elif period == 'week':
+            start = now - timedelta(days=7)
+        else:
+            return None
+        return start.astimezone(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+    def fetch_leaderboard(self, game_mode: str = None, period: str = 'all', order_by: str = 'score',
+                          limit: int = 15, cursor: tuple = None, min_ratio: float = None):
+        """
+        Página del ranking filtrada por modo de juego, período ('today', 'week', 'all') y,
+        opcionalmente, ratio mínimo score/total_questions (min_ratio, ej. 0.8 = 80 % de aciertos);
+        ordenada por puntaje ('score') o por ese ratio ('ratio').
+        La paginación es keyset: 'cursor' es el valor devuelto por la página anterior,
+        así las páginas profundas cuestan lo mismo que la primera (sin OFFSET).
+        Devuelve (DataFrame, next_cursor); next_cursor es None en la última página.
+        """
+        if period not in LEADERBOARD_PERIODS:
+            logger.error(f"Período no válido: '{period}'. Se usa 'all'.")
+            period = 'all'
+        if order_by not in LEADERBOARD_ORDERS:
+            logger.error(f"Orden no válido: '{order_by}'. Se usa 'score'.")
+            order_by = 'score'
+        sort_column = LEADERBOARD_ORDERS[order_by]  # Validado: seguro para inyectar
+
+        conditions, params = [], []
+        if game_mode:
+            conditions.append("game_mode = ?")
+            params.append(game_mode)
+        period_start = self._period_start(period)
+        if period_start:
+            conditions.append("date_played >= ?")
+            params.append(period_start)
+        if min_ratio is not None:
+            conditions.append("score_ratio >= ?")
+            params.append(float(min_ratio))
+        if cursor:
+            conditions.append(f"({sort_column}, date_played, id) < (?, ?, ?)")
+            params.extend(cursor)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = f"""
+            SELECT id, player_name, score, total_questions, game_mode, date_played, score_ratio
+            FROM Ranking
+            {where}
+            ORDER BY {sort_column} DESC, date_played DESC, id DESC
+            LIMIT ?
+        """
+        params.append(limit)
+        df = self.query(sql, params=tuple(params))
+
+        next_cursor = None
+        if len(df) == limit:
+            last = df.iloc[-1]
+            next_cursor = (last[sort_column].item(), last['date_played'], int(last['id']))
+        return df, next_cursor
+
+    #  LEADERBOARD MATERIALIZADO (top-K mantenido por triggers sobre Ranking)
+
+    def get_leaderboard_size(self):
+        """Tamaño del leaderboard materializado activo, o None si no está activado."""
+        if not self._leaderboard_size_loaded:
+            with self.connect() as conn:
+                if not conn:
+                    return None
+                try:
+                    row = conn.execute("SELECT value FROM app_settings WHERE key = 'leaderboard_size';").fetchone()
+                except sqlite3.OperationalError:
+                    row = None  # Esquema aún sin migrar
+            self._leaderboard_size = int(row[0]) if row else None
+            self._leaderboard_size_loaded = True
+        return self._leaderboard_size
+
+    def enable_leaderboard(self, size: int = LEADERBOARD_SIZE):
+        """
+        Crea (o redimensiona) la tabla RankingLeaderboard con el top-K actual y los triggers
+        que la mantienen al insertar o borrar en Ranking.
+        """
+        size = int(size)
+        with self.connect() as conn:
+            if not conn:
+                return
+            conn.execute("BEGIN;")
+            self._drop_leaderboard_objects(conn)
+            conn.execute("""
+                CREATE TABLE RankingLeaderboard (
+                    id INTEGER PRIMARY KEY,
+                    player_name TEXT NOT NULL,
+                    score INTEGER NOT NULL,
+                    total_questions INTEGER NOT NULL,
+                    game_mode TEXT NOT NULL,
+                    date_played TIMESTAMP
+                )
+            """)
+            conn.execute("""
+                CREATE INDEX idx_leaderboard_score_date
+                ON RankingLeaderboard (score DESC, date_played DESC, id DESC)
+            """)
+            top_k = f"""
+                SELECT id, player_name, score, total_questions, game_mode, date_played
+                FROM Ranking ORDER BY score DESC, date_played DESC, id DESC LIMIT {size}
+            """
+            conn.execute(f"INSERT INTO RankingLeaderboard {top_k};")
+
+            # Solo entra al top quien supera (o empata) el menor puntaje; luego se recorta a K filas
+            conn.execute(f"""
+                CREATE TRIGGER trg_leaderboard_insert AFTER INSERT ON Ranking
+                WHEN (SELECT COUNT(*) FROM RankingLeaderboard) < {size}
+                  OR NEW.score >= (SELECT MIN(score) FROM RankingLeaderboard)
+                BEGIN
+                    INSERT OR REPLACE INTO RankingLeaderboard
+                        (id, player_name, score, total_questions, game_mode, date_played)
+                    VALUES (NEW.id, NEW.player_name, NEW.score, NEW.total_questions, NEW.game_mode, NEW.date_played);
+                    DELETE FROM RankingLeaderboard WHERE id NOT IN (
+                        SELECT id FROM RankingLeaderboard
+                        ORDER BY score DESC, date_played DESC, id DESC LIMIT {size}
+                    );
+                END;
+            """)
+            # Si se borra una fila del top, se rellena desde Ranking (vía el índice cubriente)
+            conn.execute(f"""
+                CREATE TRIGGER trg_leaderboard_delete AFTER DELETE ON Ranking
+                WHEN EXISTS (SELECT 1 FROM RankingLeaderboard WHERE id = OLD.id)
+                BEGIN
+                    DELETE FROM RankingLeaderboard WHERE id = OLD.id;
+                    INSERT OR IGNORE INTO RankingLeaderboard {top_k};
+                END;
+            """)
+            conn.execute("INSERT OR REPLACE INTO app_settings (key, value) VALUES ('leaderboard_size', ?);", (str(size),))
+            conn.commit()
+
+        self._leaderboard_size = size
+        self._leaderboard_size_loaded = True
+        logger.info(f"Leaderboard materializado activado (Top {size}).")
+
+    def disable_leaderboard(self):
+        """Elimina el leaderboard materializado; fetch_top_scores vuelve a leer de Ranking."""
+        with self.connect() as conn:
+            if not conn:
+                return
+            conn.execute("BEGIN;")
+            self._drop_leaderboard_objects(conn)
+            conn.execute("DELETE FROM app_settings WHERE key = 'leaderboard_size';")
+            conn.commit()
+
+        self._leaderboard_size = None
+        self._leaderboard_size_loaded = True
+        logger.info("Leaderboard materializado desactivado.")
+
+    @staticmethod
+    def _drop_leaderboard_objects(conn):
+        conn.execute("DROP TRIGGER IF EXISTS trg_leaderboard_insert;")
+        conn.execute("DROP TRIGGER IF EXISTS trg_leaderboard_delete;")
+        conn.execute("DROP TABLE IF EXISTS RankingLeaderboard;")
+
 
     #  LÓGICA DE CARGA INICIAL 
-   
 
+    def _set_bulk_load_pragmas(self, conn, enabled: bool):
+        """
+        Relaja (o restaura) la durabilidad de SQLite mientras dura la carga masiva.
+        En modo pooled el archivo se queda en WAL: SQLite no permite salir de WAL mientras
+        haya otras conexiones abiertas (las persistentes de otros hilos), y WAL con
+        synchronous=OFF ya evita los fsync de la carga.
+        """
+        if enabled:
+            conn.execute("PRAGMA synchronous=OFF;")
+            if not self.pooled:
+                conn.execute("PRAGMA journal_mode=MEMORY;")
+            conn.execute("PRAGMA cache_size=-200000;")  # ~200 MB de caché de páginas
+        else:
+            conn.execute("PRAGMA synchronous=FULL;")
+            if not self.pooled:
+                conn.execute("PRAGMA journal_mode=DELETE;")
+
+    @staticmethod
+    def _mark_load_failed(report: dict, message: str):
+        """Marca como fallidas (0 filas) las tablas del reporte que no tenían ya su propio error."""
+        for stats in report.values():
+            stats['error'] = stats['error'] or message
+            stats['rows'] = 0
+
+    @staticmethod
+    def _insert_sql(table_name: str, columns: list) -> str:
+        """Sentencia INSERT preparada para las columnas (nombre, tipo) del CSV."""
+        column_names = ", ".join(f'"{name}"' for name, _ in columns)
+        placeholders = ", ".join("?" for _ in columns)
+        return f'INSERT INTO "{table_name}" ({column_names}) VALUES ({placeholders})'
+
+    def _create_table(self, conn, table_name: str, columns: list) -> str:
+        """(Re)crea la tabla con las columnas (nombre, tipo) del CSV y devuelve la sentencia INSERT."""
+        column_defs = ", ".join(f'"{name}" {sql_type}' for name, sql_type in columns)
+        conn.execute(f'DROP TABLE IF EXISTS "{table_name}";')
+        conn.execute(f'CREATE TABLE "{table_name}" ({column_defs});')
+        return self._insert_sql(table_name, columns)
+
+    def load_all_data(self, max_workers: int = None, tables=None, append_offsets: dict = None) -> dict:
+        """
+        Carga los CSV de DATASETS disponibles en data_dir (o solo los de 'tables').
+        El parseo corre en un pool de procesos (un archivo por worker) y un único
+        escritor, dueño de la conexión SQLite, inserta los bloques a medida que llegan.
+        append_offsets {tabla: byte} carga solo las filas agregadas desde ese byte.
+        Devuelve el reporte {tabla: {'rows', 'parse_seconds', 'write_seconds', 'error', 'mode'}}.
+        """
+        append_offsets = append_offsets or {}
+        sources = {}
+        for table_name, file_name in DATASETS.items():
+            if tables is not None and table_name not in tables:
+                continue
+            csv_path = os.path.join(self.data_dir, file_name)
+            if os.path.exists(csv_path):
+                sources[table_name] = csv_path
+            else:
+                logger.warning(f"Archivo de datos no encontrado, se omite la tabla {table_name}: {csv_path}")
+
+        report = {
+            table_name: {'rows': 0, 'parse_seconds': 0.0, 'write_seconds': 0.0, 'error': None,
+                         'mode': 'append' if append_offsets.get(table_name) else 'full'}
+            for table_name in sources
+        }
+        if not sources:
+            return report
+
+        # Conexión dedicada: los pragmas de carga masiva no deben quedar en las conexiones pooled
+        with self.connect(dedicated=True) as conn:
+            if not conn:
+                self._mark_load_failed(report, "No se pudo abrir la base de datos.")
+                return report
+
+            try:
+                self._set_bulk_load_pragmas(conn, True)
+            except sqlite3.Error as e:
+                # connect() se traga los errores de SQLite: sin esto el reporte diría 0 filas y error=None
+                logger.error(f"No se pudo preparar la conexión para la carga masiva: {e}")
+                self._mark_load_failed(report, f"No se pudo preparar la carga: {e}")
+                return report
 
-    def initialize_database(self):
-        """Inicializa la DB, carga las preguntas si es la primera vez y asegura la tabla Ranking."""
+            mp_context = multiprocessing.get_context(PARSE_START_METHOD)
+            load_queue = mp_context.Queue(maxsize=LOAD_QUEUE_SIZE)
+            workers = max_workers or min(len(sources), os.cpu_count() or 1)
+            try:
+                with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context, initializer=_init_parse_worker,
+                                         initargs=(load_queue,)) as pool:
+                    futures = [pool.submit(_parse_csv_worker, table_name, csv_path, append_offsets.get(table_name, 0))
+                               for table_name, csv_path in sources.items()]
+                    try:
+                        conn.execute("BEGIN;")
+                        self._write_parsed_chunks(conn, load_queue, futures, report)
+                        conn.commit()
+                    except Exception as e:
+                        conn.rollback()
+                        logger.error(f"Error durante la carga masiva de datos: {e}")
+                        # El rollback deshizo TODAS las tablas: ninguna quedó cargada
+                        self._mark_load_failed(report, f"Carga revertida: {e}")
+                        # Vaciamos la cola para que ningún worker quede bloqueado en put() al cerrar el pool
+                        while not all(future.done() for future in futures):
+                            try:
+                                load_queue.get(timeout=0.1)
+                            except queue.Empty:
+                                pass
+            finally:
+                self._set_bulk_load_pragmas(conn, False)
+                load_queue.close()
+
+        return report
+
+    def _write_parsed_chunks(self, conn, load_queue, futures, report: dict):
+        """
+        Escritor único: consume los mensajes de los workers hasta que todas las tablas terminan.
+        Una recarga completa escribe en la tabla de staging y la renombra sobre la original al
+        recibir 'done'; si el CSV falla, la tabla anterior queda intacta.
+        """
+        pending = set(report)
+        insert_sql = {}
+        append_base_rowid = {}  # En modo delta, última fila previa (para deshacer solo lo agregado)
+
+        while pending:
+            try:
+                kind, table_name, payload = load_queue.get(timeout=1)
+            except queue.Empty:
+                # Si un worker murió sin avisar, sus tablas nunca terminarán
+                if all(future.done() for future in futures):
+                    for table_name in pending:
+                        report[table_name]['error'] = "El proceso de parseo terminó inesperadamente."
+                        self._discard_partial_load(conn, table_name, append_base_rowid.get(table_name))
+                        logger.error(f"Error al cargar la tabla {table_name}: {report[table_name]['error']}")
+                    break
+                continue
+
+            if kind == 'schema':
+                columns, append = payload
+                if append:
+                    append_base_rowid[table_name] = conn.execute(
+                        f'SELECT COALESCE(MAX(rowid), 0) FROM "{table_name}";').fetchone()[0]
+                    insert_sql[table_name] = self._insert_sql(table_name, columns)
+                else:
+                    insert_sql[table_name] = self._create_table(conn, f"{table_name}{STAGING_SUFFIX}", columns)
+            elif kind == 'rows':
+                start_time = time.perf_counter()
+                conn.executemany(insert_sql[table_name], payload)
+                report[table_name]['write_seconds'] += time.perf_counter() - start_time
+                report[table_name]['rows'] += len(payload)
+            elif kind == 'done':
+                if table_name not in append_base_rowid:
+                    self._swap_in_staging(conn, table_name)
+                report[table_name]['parse_seconds'] = payload
+                pending.discard(table_name)
+                logger.info(f"Tabla {table_name}: {report[table_name]['rows']} filas cargadas.")
+            elif kind == 'error':
+                report[table_name]['error'] = payload
+                report[table_name]['rows'] = 0
+                self._discard_partial_load(conn, table_name, append_base_rowid.get(table_name))
+                pending.discard(table_name)
+                logger.error(f"Error al cargar la tabla {table_name}: {payload}")
+
+    @staticmethod
+    def _swap_in_staging(conn, table_name: str):
+        """Reemplaza la tabla por su staging ya completa (misma transacción: nadie ve el hueco)."""
+        staging_name = f"{table_name}{STAGING_SUFFIX}"
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name = ?;", (staging_name,)).fetchone() is None:
+            # CSV sin filas de datos: no hubo 'schema' y no hay staging; la tabla anterior se conserva
+            return
+        conn.execute(f'DROP TABLE IF EXISTS "{table_name}";')
+        conn.execute(f'ALTER TABLE "{staging_name}" RENAME TO "{table_name}";')
+
+    @staticmethod
+    def _discard_partial_load(conn, table_name: str, append_base_rowid: int = None):
+        """
+        Descarta una carga fallida sin tocar los datos anteriores: borra solo el delta
+        agregado o la tabla de staging. La tabla original nunca se elimina.
+        """
+        if append_base_rowid is not None:
+            conn.execute(f'DELETE FROM "{table_name}" WHERE rowid > ?;', (append_base_rowid,))
+        else:
+            conn.execute(f'DROP TABLE IF EXISTS "{table_name}{STAGING_SUFFIX}";')
+
+    def create_indices(self, conn):
+        """Crea los índices de consulta una vez que los datos ya están cargados."""
+        cursor = conn.cursor()
+        for index_name, table_name, columns in INDEX_DEFINITIONS:
+            existing_columns = {row[1] for row in cursor.execute(f'PRAGMA table_info("{table_name}");')}
+            if not set(columns) <= existing_columns:
+                logger.debug(f"Se omite el índice {index_name}: faltan la tabla o columnas en {table_name}.")
+                continue
+
+            column_list = ", ".join(f'"{col}"' for col in columns)
+            cursor.execute(f'CREATE INDEX IF NOT EXISTS {index_name} ON "{table_name}" ({column_list});')
+
+        # Estadísticas para que el planificador elija los índices recién creados
+        cursor.execute("ANALYZE;")
+        conn.commit()
+
+
+    #  TABLA DERIVADA: player_season_stats (una fila por jugador, club, competición y temporada)
+
+    def build_player_season_stats(self, conn) -> bool:
+        """
+        Reconstruye player_season_stats agregando 'appearances' UNA vez (en la ingesta),
+        para que el DataAnalyzer resuelva sus top-N con rangos de índice en vez de
+        GROUP BY sobre millones de apariciones. Devuelve False si faltan tablas o columnas.
+        """
+        cursor = conn.cursor()
+        appearance_columns = {row[1] for row in cursor.execute('PRAGMA table_info("appearances");')}
+        required = {'player_id', 'player_club_id', 'competition_id', 'date', *PLAYER_SEASON_STATS_SUMS}
+        existing_tables = {row[0] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")}
+        if not required <= appearance_columns or not {'players', 'clubs'} <= existing_tables:
+            logger.warning("No se construye player_season_stats: faltan tablas o columnas de origen.")
+            return False
+
+        start_time = time.time()
+        sums = ", ".join(f"SUM(A.{col}) AS {col}" for col in PLAYER_SEASON_STATS_SUMS)
+        try:
+            cursor.execute("BEGIN;")
+            cursor.execute("DROP TABLE IF EXISTS player_season_stats;")
+            cursor.execute(f"""
+                CREATE TABLE player_season_stats (
+                    player_id INTEGER NOT NULL,
+                    club_id INTEGER,
+                    competition_id TEXT,
+                    season INTEGER,
+                    player_name TEXT,
+                    club_name TEXT,
+                    appearances INTEGER NOT NULL,
+                    {", ".join(f"{col} INTEGER" for col in PLAYER_SEASON_STATS_SUMS)}
+                );
+            """)
+            # Mismas reglas que las consultas originales: el jugador debe existir en 'players';
+            # el nombre del club queda NULL si el club no está en 'clubs'. Las apariciones sin club,
+            # competición o fecha se conservan (con NULL en esa clave; el GROUP BY ya hace única
+            # cada fila): cuentan para los totales históricos y las consultas por liga las excluyen solas
+            cursor.execute(f"""
+                INSERT INTO player_season_stats
+                SELECT
+                    A.player_id,
+                    A.player_club_id,
+                    A.competition_id,
+                    {SEASON_SQL.replace('date', 'A.date')} AS season,
+                    P.name,
+                    C.name,
+                    COUNT(*),
+                    {sums}
+                FROM appearances AS A
+                INNER JOIN players AS P ON P.player_id = A.player_id
+                LEFT JOIN clubs AS C ON C.club_id = A.player_club_id
+                GROUP BY A.player_id, A.player_club_id, A.competition_id, season;
+            """)
+            for index_name, columns in PLAYER_SEASON_STATS_INDEXES:
+                cursor.execute(f"CREATE INDEX {index_name} ON player_season_stats ({', '.join(columns)});")
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            logger.error(f"Error al construir player_season_stats: {e}")
+            return False
+
+        cursor.execute("ANALYZE player_season_stats;")
+        conn.commit()
+        row_count = cursor.execute("SELECT COUNT(*) FROM player_season_stats;").fetchone()[0]
+        logger.info(f"player_season_stats construida: {row_count:,} filas en {time.time() - start_time:.2f} s.")
+        return True
+
+    #  REFRESCO INCREMENTAL DE DATOS (manifiesto con tamaño, mtime y hash por archivo)
+
+    @staticmethod
+    def _create_manifest_table(conn):
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS dataset_manifest (
+                table_name TEXT PRIMARY KEY,
+                file_name TEXT NOT NULL,
+                file_size INTEGER NOT NULL,
+                file_mtime REAL NOT NULL,
+                sha256 TEXT NOT NULL,
+                row_count INTEGER NOT NULL,
+                loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+    @staticmethod
+    def _record_manifest(conn, table_name: str, fingerprint: dict, row_count: int):
+        conn.execute("""
+            INSERT OR REPLACE INTO dataset_manifest
+                (table_name, file_name, file_size, file_mtime, sha256, row_count, loaded_at)
+            VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """, (table_name, DATASETS[table_name], fingerprint['file_size'],
+              fingerprint['file_mtime'], fingerprint['sha256'], row_count))
+
+    def table_version(self, table_name: str):
+        """
+        Huella barata del contenido de una tabla de datos: sha256 del CSV según el manifiesto,
+        cantidad de filas y max(rowid). Cambia con cualquier recarga o inserción, así sirve
+        para invalidar cachés derivados. Devuelve None si la tabla no existe.
+        """
+        if table_name not in DATASETS:
+            raise ValueError(f"Tabla de datos desconocida: {table_name}")
+        with self.connect() as conn:
+            if not conn:
+                return None
+            try:
+                rows, max_rowid = conn.execute(f"SELECT COUNT(*), MAX(rowid) FROM {table_name};").fetchone()
+            except sqlite3.OperationalError:
+                return None  # La tabla aún no fue cargada
+            try:
+                manifest = conn.execute(
+                    "SELECT sha256 FROM dataset_manifest WHERE table_name = ?;", (table_name,)
+                ).fetchone()
+            except sqlite3.OperationalError:
+                manifest = None
+        return (manifest[0] if manifest else None, rows, max_rowid)
+
+    def refresh_datasets(self) -> dict:
+        """
+        Compara cada CSV de data_dir con el manifiesto y recarga solo las tablas cuyo
+        archivo cambió. Los archivos APPEND_ONLY_DATASETS que solo crecieron cargan el delta.
+        La tabla Ranking nunca se toca. Devuelve el reporte de carga (vacío si no hubo cambios).
+        """
+        with self.connect() as conn:
+            if not conn:
+                return {}
+            self._create_manifest_table(conn)
+            conn.commit()
+            manifest = {row['table_name']: dict(row) for row in conn.execute("SELECT * FROM dataset_manifest;")}
+            existing_tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table';")}
+
+        to_load, append_offsets, fingerprints, unchanged = [], {}, {}, []
+        for table_name, file_name in DATASETS.items():
+            csv_path = os.path.join(self.data_dir, file_name)
+            if table_name in PROTECTED_TABLES or not os.path.exists(csv_path):
+                continue
+
+            previous = manifest.get(table_name) if table_name in existing_tables else None
+            stat = os.stat(csv_path)
+
+            # Chequeo barato primero: mismo tamaño y mtime => sin cambios, no se calcula el hash
+            if previous and previous['file_size'] == stat.st_size and previous['file_mtime'] == stat.st_mtime:
+                continue
+
+            grew = previous is not None and stat.st_size > previous['file_size']
+            prefix_size = previous['file_size'] if grew and table_name in APPEND_ONLY_DATASETS else None
+            fingerprint = _file_fingerprint(csv_path, prefix_size)
+            fingerprints[table_name] = fingerprint
+
+            if previous and fingerprint['sha256'] == previous['sha256']:
+                unchanged.append(table_name)  # Solo cambió el mtime
+                continue
+
+            if prefix_size and fingerprint['prefix_sha256'] == previous['sha256'] \
+                    and fingerprint['prefix_ends_with_newline']:
+                append_offsets[table_name] = prefix_size
+            to_load.append(table_name)
+
+        load_report = {}
+        if to_load:
+            logger.info(f"Datasets a recargar: {', '.join(to_load)} (delta: {', '.join(append_offsets) or 'ninguno'}).")
+            load_report = self.load_all_data(tables=to_load, append_offsets=append_offsets)
+
+        with self.connect() as conn:
+            if not conn:
+                return load_report
+
+            for table_name in unchanged:
+                self._record_manifest(conn, table_name, fingerprints[table_name], manifest[table_name]['row_count'])
+
+            for table_name, stats in load_report.items():
+                if stats['error']:
+                    continue
+                row_count = stats['rows']
+                if stats['mode'] == 'append':
+                    row_count += manifest[table_name]['row_count']
+                self._record_manifest(conn, table_name, fingerprints[table_name], row_count)
+            conn.commit()
+
+            if load_report:
+                self.create_indices(conn)
+
+            # La tabla derivada sigue a sus orígenes: se reconstruye si cambió alguno (o si todavía no existe)
+            sources_reloaded = any(
+                table_name in load_report and not load_report[table_name]['error']
+                for table_name in PLAYER_SEASON_STATS_SOURCES
+            )
+            if sources_reloaded or 'player_season_stats' not in existing_tables:
+                self.build_player_season_stats(conn)
+
+        return load_report
+
+    def initialize_database(self) -> dict:
+        """
+        Inicializa la DB: carga los datos la primera vez, recarga solo los CSV que cambiaron
+        en los arranques siguientes y asegura la tabla Ranking.
+        Devuelve el reporte de carga por tabla (vacío si no hubo nada que cargar).
+        """
         db_exists = os.path.exists(self.db_path)
         
         if db_exists:
-            print("Base de datos ya existente. Saltando la carga inicial de preguntas.")
+            print("Base de datos ya existente. Verificando cambios en los archivos de datos.")
         else:
             print(f"Conexión exitosa a la base de datos: {self.db_path}")
-            print(" INICIANDO CARGA MÍNIMA: SOLO PREGUNTAS FIJAS.")
-            self.load_all_data() 
-            
-            with self.connect() as conn:
-                if conn:
-                    self.create_indices(conn) 
+            print(" INICIANDO CARGA INICIAL DE DATOS.")
+
+        load_report = self.refresh_datasets()
+
+        #  Asegura que la tabla de Ranking exista y esté actualizada (solo migraciones pendientes).
+        self.migrate_schema()
 
-        #  Asegura que la tabla de Ranking exista y esté actualizada.
-        self._create_ranking_table()
+        return load_report
 
 
 
@@ -0,0 +1,191 @@
+# core/score_writer.py
+
+import os
+import json
+import time
+import uuid
+import queue
+import sqlite3
+import logging
+import threading
+
+from PySide6.QtCore import QObject, Signal
+
+from core.database_manager import DatabaseManager
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# ----------------------------------------------------------------------
+# CONFIGURACIÓN DEL ESCRITOR DE PUNTAJES
+# ----------------------------------------------------------------------
+BATCH_MAX_SIZE = 50          # Puntajes por transacción como máximo
+BATCH_WINDOW_SECONDS = 0.2   # Tiempo que se espera a que lleguen más puntajes para el mismo lote
+LOCK_RETRIES = 5             # Reintentos ante 'database is locked'
+LOCK_BACKOFF_SECONDS = 0.1   # Espera inicial entre reintentos (se duplica en cada intento)
+# Campos obligatorios de cada línea del archivo de cola
+SPOOL_FIELDS = {'submission_id', 'player_name', 'score', 'total_questions', 'game_mode'}
+
+
+class ScoreWriter(QObject):
+    """
+    Escritor de puntajes en segundo plano. Los puntajes se anotan primero en un archivo
+    de cola (JSON Lines) junto a la DB, luego un hilo los agrupa en una transacción por
+    lote y avisa a la UI con 'score_saved' solo cuando el commit se realizó.
+    Los puntajes que quedaron en la cola (cierre inesperado) se reenvían al iniciar.
+    """
+    # (submission_id, ok, mensaje de error)
+    score_saved = Signal(str, bool, str)
+
+    _STOP = object()
+
+    def __init__(self, db_manager: DatabaseManager, spool_path: str = None, parent=None):
+        super().__init__(parent)
+        self.db_manager = db_manager
+        self.spool_path = spool_path or os.path.splitext(db_manager.db_path)[0] + '.pending_scores.jsonl'
+
+        self._queue = queue.Queue()
+        self._pending = {}  # submission_id -> puntaje aún no confirmado (espejo del archivo de cola)
+        self._spool_lock = threading.Lock()
+        self._thread = None
+
+    # --- API pública (hilo de la GUI) ---
+
+    def start(self):
+        """Reenvía los puntajes pendientes de la sesión anterior y arranca el hilo escritor."""
+        for item in self._read_spool():
+            self._pending[item['submission_id']] = item
+            self._queue.put(item)
+        if self._pending:
+            logger.info(f"Reenviando {len(self._pending)} puntajes pendientes de la sesión anterior.")
+
+        self._thread = threading.Thread(target=self._run, name="ScoreWriter", daemon=True)
+        self._thread.start()
+
+    def submit(self, player_name: str, score: int, total_questions: int, game_mode: str,
+               submission_id: str = None) -> str:
+        """
+        Encola un puntaje (sin tocar la DB) y devuelve su submission_id.
+        Para reintentar un puntaje que falló se pasa su submission_id: la entrada pendiente
+        se reemplaza (ej. con otro nombre) en vez de agregar otra, así nunca se guarda dos veces.
+        """
+        item = {
+            'submission_id': submission_id or uuid.uuid4().hex,
+            'player_name': player_name,
+            'score': score,
+            'total_questions': total_questions,
+            'game_mode': game_mode,
+        }
+        with self._spool_lock:
+            replacing = item['submission_id'] in self._pending
+            self._pending[item['submission_id']] = item
+            if replacing:
+                self._rewrite_spool()
+            else:
+                with open(self.spool_path, 'a', encoding='utf-8') as spool:
+                    spool.write(json.dumps(item, ensure_ascii=False) + "\n")
+        self._queue.put(item)
+        return item['submission_id']
+
+    def stop(self, timeout: float = 5.0):
+        """Escribe lo que quede en la cola y detiene el hilo (llamar al cerrar la app)."""
+        if self._thread and self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join(timeout)
+        self._thread = None
+
+    # --- Hilo escritor ---
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                return
+
+            # Agrupa lo que llegue dentro de la ventana de tiempo en un solo lote
+            batch = [item]
+            stop_requested = False
+            deadline = time.monotonic() + BATCH_WINDOW_SECONDS
+            while len(batch) < BATCH_MAX_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    next_item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if next_item is self._STOP:
+                    stop_requested = True
+                    break
+                batch.append(next_item)
+
+            self._write_batch(batch)
+            if stop_requested:
+                return
+
+    def _write_batch(self, batch: list):
+        """Escribe el lote reintentando si la DB está bloqueada y notifica cada puntaje."""
+        error = None
+        for attempt in range(LOCK_RETRIES + 1):
+            try:
+                self.db_manager.save_scores(batch)
+                error = None
+                break
+            except sqlite3.OperationalError as e:
+                error = e
+                if 'locked' not in str(e) or attempt == LOCK_RETRIES:
+                    break
+                delay = LOCK_BACKOFF_SECONDS * (2 ** attempt)
+                logger.warning(f"DB bloqueada al guardar {len(batch)} puntajes; reintento en {delay:.1f} s.")
+                time.sleep(delay)
+            except sqlite3.Error as e:
+                error = e
+                break
+
+        if error:
+            if isinstance(error, sqlite3.OperationalError):
+                # Falla transitoria (DB bloqueada o inaccesible): quedan en la cola para el próximo inicio
+                logger.error(f"No se pudieron guardar {len(batch)} puntajes: {error}")
+            else:
+                # Falla permanente (ej. restricción violada): reenviarlos en cada inicio no serviría
+                logger.error(f"Se descartan {len(batch)} puntajes que no se pueden guardar: {error}")
+                self._forget(batch)
+            for item in batch:
+                self.score_saved.emit(item['submission_id'], False, str(error))
+            return
+
+        self._forget(batch)
+        logger.info(f"Lote de {len(batch)} puntajes guardado.")
+        for item in batch:
+            self.score_saved.emit(item['submission_id'], True, "")
+
+    # --- Archivo de cola ---
+
+    def _read_spool(self) -> list:
+        if not os.path.exists(self.spool_path):
+            return []
+        items = {}
+        with open(self.spool_path, encoding='utf-8') as spool:
+            for line in spool:
+                try:
+                    item = json.loads(line)
+                except json.JSONDecodeError:
+                    item = None
+                if not isinstance(item, dict) or not SPOOL_FIELDS <= item.keys():
+                    logger.warning("Línea corrupta en la cola de puntajes; se descarta.")
+                    continue
+                items[item['submission_id']] = item  # La última versión de cada envío
+        return list(items.values())
+
+    def _forget(self, batch: list):
+        """Quita del archivo de cola los puntajes ya confirmados (o descartados)."""
+        with self._spool_lock:
+            for item in batch:
+                self._pending.pop(item['submission_id'], None)
+            self._rewrite_spool()
+
+    def _rewrite_spool(self):
+        """Reescribe el archivo de cola con los puntajes pendientes (llamar con _spool_lock tomado)."""
+        with open(self.spool_path, 'w', encoding='utf-8') as spool:
+            for item in self._pending.values():
+                spool.write(json.dumps(item, ensure_ascii=False) + "\n")
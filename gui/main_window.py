@@ -1,12 +1,15 @@
 # gui/main_window.py 
 
 from PySide6.QtWidgets import QMainWindow, QStackedWidget, QApplication, QMessageBox
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QEvent, QTimer
 import sys
+import time
 import logging
 
-# Importa el gestor de la DB.
-from core.database_manager import DatabaseManager 
+# Contenedor de servicios compartidos (DatabaseManager, QuizGenerator, DataAnalyzer)
+from core.app_context import AppContext
+# Escritor de puntajes en segundo plano
+from core.score_writer import ScoreWriter
 # Importa el generador de preguntas
 from logic.quiz_generator import QuizGenerator 
 
@@ -16,6 +19,7 @@ from gui.mode_selection_view import ModeSelectionView
 from gui.ranking_view import RankingView
 from gui.quiz_app import QuizApp 
 from gui.results_view import ResultsView 
+from gui.workers import run_in_background
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -23,20 +27,36 @@ logger.setLevel(logging.INFO)
 class MainWindow(QMainWindow):
     """Clase principal que gestiona la navegación entre vistas usando QStackedWidget."""
     
-    # Indices para la navegación (Clave para QStackedWidget)
+    # Indices para la navegación (identifican cada vista; el orden en el stack depende de cuándo se construye)
     MENU_INDEX = 0
     MODE_SELECT_INDEX = 1 
     QUIZ_INDEX = 2 
     RESULTS_INDEX = 3
     RANKING_INDEX = 4
 
-    def __init__(self):
+    def __init__(self, context: AppContext = None, started_at: float = None):
+        """
+        context: servicios compartidos creados en main.py (se crea uno propio si no se recibe).
+        started_at: instante (time.perf_counter) desde el que se mide el tiempo hasta el primer frame.
+        """
         super().__init__()
+        self._started_at = started_at if started_at is not None else time.perf_counter()
+        self._first_frame_shown = False
         
         # 1. Inicialización de Gestores y Generadores
-        self.db_manager = DatabaseManager()
-        self.db_manager.initialize_database() 
-        self.quiz_generator = QuizGenerator() 
+        # Un único DatabaseManager (pooled) compartido por el ranking, los puntajes y el QuizGenerator
+        self.context = context or AppContext()
+        self.db_manager = self.context.db_manager
+        # La DB y el QuizGenerator se preparan en segundo plano tras el primer frame (ver _load_backend)
+        self.quiz_generator = None
+        self._backend_error = None
+
+        # Los puntajes se guardan por lotes en otro hilo; la confirmación llega por señal
+        self.score_writer = ScoreWriter(self.db_manager)
+        self.score_writer.score_saved.connect(self._handle_score_saved)
+        self._pending_submission_id = None
+        # Puntaje de la partida actual cuyo guardado falló: un reintento reutiliza su submission_id
+        self._retry_submission_id = None
         
         self.setWindowTitle("Fútbolmanía - La Leyenda")
         self.setGeometry(100, 100, 850, 650)
@@ -46,54 +66,139 @@ class MainWindow(QMainWindow):
         self.stacked_widget = QStackedWidget()
         self.setCentralWidget(self.stacked_widget)
         
-        # 3. Inicializar las vistas 
-        self.menu_view = MenuPrincipal() 
-        self.mode_select_view = ModeSelectionView(quiz_generator=self.quiz_generator) 
-        self.quiz_view = QuizApp(quiz_generator=self.quiz_generator) 
-        self.results_view = ResultsView() 
-        self.ranking_view = RankingView() 
-        
-        # Carga inicial del ranking (llamando al método con el db_manager)
-        self.ranking_view.load_ranking_data(self.db_manager) 
-        
-        # 4. Añadir vistas al stack 
-        self.stacked_widget.addWidget(self.menu_view)     # Index 0
-        self.stacked_widget.addWidget(self.mode_select_view) # Index 1
-        self.stacked_widget.addWidget(self.quiz_view)     # Index 2
-        self.stacked_widget.addWidget(self.results_view)   # Index 3
-        self.stacked_widget.addWidget(self.ranking_view)   # Index 4
-        
-        # 5. Conectar señales de navegación y flujo
-        self._setup_connections()
+        # 3. Solo el menú se construye antes del primer frame; el resto al navegar por primera vez
+        self._views = {}
+        self._view_factories = {
+            self.MENU_INDEX: self._build_menu_view,
+            self.MODE_SELECT_INDEX: self._build_mode_select_view,
+            self.QUIZ_INDEX: self._build_quiz_view,
+            self.RESULTS_INDEX: self._build_results_view,
+            self.RANKING_INDEX: self._build_ranking_view,
+        }
 
         # Iniciar en el menú
         self.navigate_to(self.MENU_INDEX)
 
-    def _setup_connections(self):
-        #  Menú 
-        self.menu_view.start_mode_selection.connect(lambda: self.navigate_to(self.MODE_SELECT_INDEX))
-        self.menu_view.show_ranking.connect(self.navigate_to_ranking) 
-        self.ranking_view.back_to_menu.connect(lambda: self.navigate_to(self.MENU_INDEX))
-        self.mode_select_view.start_selected_quiz.connect(self.start_new_quiz) 
-        self.mode_select_view.back_to_menu.connect(lambda: self.navigate_to(self.MENU_INDEX))
+        # 4. El primer paint del menú marca el primer frame y dispara la carga en segundo plano
+        self.menu_view.installEventFilter(self)
 
-        #  Flujo del Quiz 
-        self.quiz_view.quiz_finished.connect(self.handle_quiz_finished) 
-        
-        #  Vista de Resultados 
+    #  CONSTRUCCIÓN PEREZOSA DE VISTAS 
+
+    def _view(self, index: int):
+        """Devuelve la vista del índice dada, construyéndola (y conectando sus señales) la primera vez."""
+        view = self._views.get(index)
+        if view is None:
+            build_start = time.perf_counter()
+            view = self._view_factories[index]()
+            self._views[index] = view
+            self.stacked_widget.addWidget(view)
+            logger.debug(f"Vista {type(view).__name__} construida en {(time.perf_counter() - build_start) * 1000:.1f} ms.")
+        return view
+
+    @property
+    def menu_view(self) -> MenuPrincipal:
+        return self._view(self.MENU_INDEX)
+
+    @property
+    def mode_select_view(self) -> ModeSelectionView:
+        return self._view(self.MODE_SELECT_INDEX)
+
+    @property
+    def quiz_view(self) -> QuizApp:
+        return self._view(self.QUIZ_INDEX)
+
+    @property
+    def results_view(self) -> ResultsView:
+        return self._view(self.RESULTS_INDEX)
+
+    @property
+    def ranking_view(self) -> RankingView:
+        return self._view(self.RANKING_INDEX)
+
+    def _build_menu_view(self) -> MenuPrincipal:
+        view = MenuPrincipal()
+        view.start_mode_selection.connect(lambda: self.navigate_to(self.MODE_SELECT_INDEX))
+        view.show_ranking.connect(self.navigate_to_ranking)
+        return view
+
+    def _build_mode_select_view(self) -> ModeSelectionView:
+        view = ModeSelectionView(quiz_generator=self.quiz_generator)
+        if self._backend_error:
+            view._set_loading(True, "Error al cargar las preguntas")
+        view.start_selected_quiz.connect(self.start_new_quiz)
+        view.back_to_menu.connect(lambda: self.navigate_to(self.MENU_INDEX))
+        return view
+
+    def _build_quiz_view(self) -> QuizApp:
+        view = QuizApp(quiz_generator=self.quiz_generator)
+        view.quiz_finished.connect(self.handle_quiz_finished)
+        return view
+
+    def _build_results_view(self) -> ResultsView:
+        view = ResultsView()
         #  La señal de guardado llama al controlador (MainWindow)
         # La señal DEBE emitir: (player_name: str, score: int, total_questions: int, game_mode: str)
-        self.results_view.save_score_requested.connect(self._handle_save_score_request)
-        
-        self.results_view.start_new_quiz_request.connect(lambda: self.navigate_to(self.MODE_SELECT_INDEX))
-        self.results_view.show_ranking_request.connect(self.navigate_to_ranking)
-        self.results_view.back_to_menu_request.connect(lambda: self.navigate_to(self.MENU_INDEX))
-        
+        view.save_score_requested.connect(self._handle_save_score_request)
+        view.start_new_quiz_request.connect(lambda: self.navigate_to(self.MODE_SELECT_INDEX))
+        view.show_ranking_request.connect(self.navigate_to_ranking)
+        view.back_to_menu_request.connect(lambda: self.navigate_to(self.MENU_INDEX))
+        return view
+
+    def _build_ranking_view(self) -> RankingView:
+        view = RankingView()
+        view.back_to_menu.connect(lambda: self.navigate_to(self.MENU_INDEX))
+        return view
+
+    #  PRIMER FRAME Y CARGA EN SEGUNDO PLANO 
+
+    def eventFilter(self, watched, event):
+        if not self._first_frame_shown and event.type() == QEvent.Type.Paint and watched is self._views.get(self.MENU_INDEX):
+            self._first_frame_shown = True
+            watched.removeEventFilter(self)
+            # Se espera a que termine este ciclo de pintado antes de medir y lanzar la carga
+            QTimer.singleShot(0, self._on_first_frame)
+        return super().eventFilter(watched, event)
+
+    def _on_first_frame(self):
+        logger.info(f"Primer frame en pantalla a los {(time.perf_counter() - self._started_at) * 1000:.0f} ms.")
+        run_in_background(self._load_backend, on_result=self._on_backend_ready, on_error=self._on_backend_error)
+
+    def _load_backend(self) -> QuizGenerator:
+        """Corre en el QThreadPool: asegura la DB y precalienta el banco de preguntas y el DataAnalyzer."""
+        load_start = time.perf_counter()
+        # initialize_database() corre aquí, una vez por sesión (AppContext registra el reporte de carga)
+        quiz_generator = self.context.warm_up()
+        logger.info(f"Banco de preguntas y DataAnalyzer precalentados en {time.perf_counter() - load_start:.2f} s.")
+        return quiz_generator
+
+    def _on_backend_ready(self, quiz_generator: QuizGenerator):
+        """De vuelta en la GUI: entrega el generador a las vistas ya construidas y arranca el escritor de puntajes."""
+        self.quiz_generator = quiz_generator
+        if self.QUIZ_INDEX in self._views:
+            self.quiz_view.quiz_generator = quiz_generator
+        if self.MODE_SELECT_INDEX in self._views:
+            self.mode_select_view.set_quiz_generator(quiz_generator)
+        self.score_writer.start()
+        logger.info("Banco de preguntas listo.")
+
+        # Fuentes dinámicas (goleadores, Balón de Oro, ligas): cada tipo se habilita al cargarse
+        run_in_background(
+            quiz_generator.load_dynamic_sources,
+            on_result=lambda types: logger.info(f"Tipos de pregunta disponibles: {', '.join(types)}"),
+        )
+
+    def _on_backend_error(self, message: str):
+        logger.error(f"Error CRÍTICO al preparar la base de datos o las preguntas: {message}")
+        self._backend_error = message
+        if self.MODE_SELECT_INDEX in self._views:
+            self.mode_select_view._set_loading(True, "Error al cargar las preguntas")
+        QMessageBox.critical(self, "Error de Carga", f"No se pudieron cargar las preguntas: {message}")
+
     # MÉTODOS DE FLUJO 
 
     def navigate_to(self, index):
-        """Método seguro para cambiar de vista."""
-        self.stacked_widget.setCurrentIndex(index)
+        """Método seguro para cambiar de vista (la construye si es la primera vez)."""
+        self.stacked_widget.setCurrentWidget(self._view(index))
 
     def navigate_to_ranking(self):
         """Recarga los datos usando el db_manager y navega al ranking."""
@@ -110,26 +215,37 @@ class MainWindow(QMainWindow):
         total_questions = self.quiz_view.total_questions
         game_mode_to_save = self.quiz_view.current_game_mode 
         
+        self._retry_submission_id = None  # Nueva partida: nuevo puntaje
         self.results_view.update_results(final_score, total_questions, game_mode_to_save)
         self.navigate_to(self.RESULTS_INDEX)
 
+    def closeEvent(self, event):
+        """Vacía la cola de puntajes y cierra las conexiones persistentes de la DB al cerrar la ventana."""
+        self.score_writer.stop()
+        self.context.close()
+        super().closeEvent(event)
+
     #  MÉTODO DE GUARDADO CENTRALIZADO 
 
     def _handle_save_score_request(self, player_name: str, score: int, total_questions: int, game_mode: str):
         """
-        SLOT que recibe la petición de guardado desde ResultsView y 
-        ejecuta la lógica de persistencia.
+        SLOT que recibe la petición de guardado desde ResultsView y la encola en el
+        ScoreWriter. No bloquea la GUI: la confirmación llega en _handle_score_saved.
         """
-        if self.db_manager:
-            try:
-                # LLAMADA FINAL Y CENTRALIZADA A LA BASE DE DATOS
-                self.db_manager.save_score(player_name, score, total_questions, game_mode)
-                logger.info(f"Puntaje guardado por MainWindow: {player_name}, {score}, Modo: {game_mode}")
-            except Exception as e:
-                logger.error(f"ERROR al guardar score desde MainWindow: {e}")
-                QMessageBox.warning(self, "Error de Guardado", f"No se pudo guardar el puntaje: {e}")
-        else:
-            logger.error("ERROR: DatabaseManager no inicializado para guardar score.")
+        self._pending_submission_id = self.score_writer.submit(
+            player_name, score, total_questions, game_mode, submission_id=self._retry_submission_id
+        )
+        logger.info(f"Puntaje encolado por MainWindow: {player_name}, {score}, Modo: {game_mode}")
+
+    def _handle_score_saved(self, submission_id: str, ok: bool, error_message: str):
+        """SLOT del ScoreWriter: avisa a ResultsView cuando SU puntaje quedó (o no) confirmado."""
+        if submission_id != self._pending_submission_id:
+            return  # Puntaje reenviado de una sesión anterior
+        self._pending_submission_id = None
+        self._retry_submission_id = None if ok else submission_id
+        self.results_view.on_score_saved(ok, error_message)
+        if not ok:
+            logger.error(f"ERROR al guardar score desde MainWindow: {error_message}")
 
 
 if __name__ == '__main__':
@@ -1,7 +1,7 @@
 # gui/menu_principal.py 
 
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton
-from PySide6.QtUiTools import QUiLoader 
+from gui.ui_loader import load_ui  # Usa el .ui precompilado si está disponible
 from PySide6.QtCore import Signal
 import os
 
@@ -20,8 +20,7 @@ class MenuPrincipal(QWidget):
         super().__init__()
         
         # 1. Carga el diseño visual desde el archivo .ui
-        loader = QUiLoader()
-        self.ui = loader.load(UI_FILE, self)
+        self.ui = load_ui(UI_FILE, self)
         
         if self.ui:
             # Pasa el control del layout del QWidget principal al objeto cargado
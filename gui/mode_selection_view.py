@@ -3,7 +3,7 @@
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QRadioButton, QComboBox, QPushButton
 )
-from PySide6.QtUiTools import QUiLoader #  Importación clave para cargar el .ui
+from gui.ui_loader import load_ui  # Usa el .ui precompilado si está disponible
 from PySide6.QtCore import Qt, Signal
 import os
 import logging
@@ -24,18 +24,18 @@ class ModeSelectionView(QWidget):
     start_selected_quiz = Signal(str, str) # category, game_mode
     back_to_menu = Signal()
 
-    def __init__(self, quiz_generator: QuizGenerator):
+    def __init__(self, quiz_generator: QuizGenerator = None):
         super().__init__()
         
+        # El QuizGenerator puede llegar después (se carga en segundo plano): ver set_quiz_generator
         self.quiz_generator = quiz_generator 
-        self.categories = self.quiz_generator.get_available_categories()
+        self.categories = ["General"]
         
         self.selected_mode = "TriviaClasica" 
         self.selected_category = "General" 
         
         # 1. Carga el diseño visual desde el .ui
-        loader = QUiLoader()
-        self.ui = loader.load(UI_FILE, self)
+        self.ui = load_ui(UI_FILE, self)
         
         if self.ui:
             # Configura el layout principal para contener el diseño cargado
@@ -62,10 +62,29 @@ class ModeSelectionView(QWidget):
             self.btn_back.clicked.connect(self.back_to_menu.emit)
             
         # 4. Inicialización
-        self._populate_categories()
+        self._start_button_text = self.btn_start_quiz.text() if self.btn_start_quiz else ""
+        if self.quiz_generator:
+            self.set_quiz_generator(self.quiz_generator)
+        else:
+            self._set_loading(True)
+            self._populate_categories()
         # Asegura que el estado inicial de la categoría esté correcto
         self._set_mode("TriviaClasica") # Inicia en modo Clásico
 
+    def set_quiz_generator(self, quiz_generator: QuizGenerator):
+        """Recibe el QuizGenerator ya cargado, llena las categorías y habilita el inicio."""
+        self.quiz_generator = quiz_generator
+        self.categories = self.quiz_generator.get_available_categories()
+        self._populate_categories()
+        self._set_mode(self.selected_mode)
+        self._set_loading(False)
+
+    def _set_loading(self, loading: bool, message: str = "Cargando preguntas..."):
+        """Estado de carga: no se puede iniciar un quiz hasta que el banco de preguntas esté listo."""
+        if self.btn_start_quiz:
+            self.btn_start_quiz.setEnabled(not loading)
+            self.btn_start_quiz.setText(message if loading else self._start_button_text)
+
 
     def _find_ui_widgets(self):
         """Busca y asigna los widgets cargados del .ui a variables de instancia."""
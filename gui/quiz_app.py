@@ -1,12 +1,16 @@
 # gui/quiz_app.py 
 
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QLabel, QPushButton, QMessageBox, QSizePolicy
+    QWidget, QVBoxLayout, QLabel, QPushButton, QSizePolicy, QButtonGroup
 )
-from PySide6.QtUiTools import QUiLoader #  Importación clave para cargar el .ui
-from PySide6.QtCore import Qt, Signal 
+from gui.ui_loader import load_ui  # Usa el .ui precompilado si está disponible
+from PySide6.QtCore import Qt, Signal, QTimer
 from logic.quiz_generator import QuizGenerator
+from gui.workers import run_in_background
+from collections import deque
+import statistics
 import logging
+import time
 import os
 
 # ----------------------------------------------------------------------
@@ -18,6 +22,47 @@ logger.setLevel(logging.INFO)
 # Define la ruta al archivo .ui 
 UI_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'ui', 'quiz_app.ui')
 
+# Preguntas ya generadas que se mantienen listas mientras el jugador responde
+PREFETCH_SIZE = 2
+
+# Tiempo que se muestra el resultado de cada respuesta antes de pasar solo a la siguiente (0 = esperar el clic)
+FEEDBACK_DELAY_MS = 1500
+
+# ----------------------------------------------------------------------
+# ESTILOS DEL QUIZ
+# ----------------------------------------------------------------------
+# Una sola hoja de estilos que se parsea una vez al crear la vista. Cada estado visual
+# (intro/pregunta/fin, correcta/incorrecta) es una propiedad dinámica: cambiar de estado
+# solo cambia la propiedad y re-pule ese widget (ver _set_style_state).
+QUIZ_STYLESHEET = """
+QLabel#question_label {
+    font-size: 24px; margin: 20px 0; padding: 15px;
+    background-color: #444444; color: white; border-radius: 5px;
+}
+QLabel#question_label[state="intro"] { background-color: #007bff; }
+QLabel#question_label[state="finished"] { background-color: #f0ad4e; }
+
+QPushButton#control_button {
+    background-color: #555555; color: white; padding: 18px;
+    font-size: 20px; margin-top: 30px; border-radius: 8px;
+}
+QPushButton#control_button[state="start"] { background-color: #28a745; }
+
+#options_container QPushButton {
+    padding: 12px; font-size: 16px; border: none; border-radius: 4px;
+    background-color: #555555; color: white;
+}
+#options_container QPushButton:hover { background-color: #666666; }
+#options_container QPushButton[answer="correct"] { background-color: #28a745; }
+#options_container QPushButton[answer="wrong"] { background-color: #dc3545; }
+
+QLabel#feedback_overlay {
+    color: white; font-size: 22px; font-weight: bold; padding: 16px; border-radius: 8px;
+}
+QLabel#feedback_overlay[result="correct"] { background-color: #28a745; }
+QLabel#feedback_overlay[result="wrong"] { background-color: #dc3545; }
+"""
+
 # ----------------------------------------------------------------------
 # CLASE PRINCIPAL DE LA APLICACIÓN
 # ----------------------------------------------------------------------
@@ -27,11 +72,12 @@ class QuizApp(QWidget):
     quiz_finished = Signal(int)
 
     # El constructor recibe el QuizGenerator ya cargado
-    def __init__(self, quiz_generator=None): 
+    def __init__(self, quiz_generator=None, feedback_delay_ms: int = FEEDBACK_DELAY_MS): 
         super().__init__()
         
         self.quiz_generator = quiz_generator 
         self.current_question = None
+        self._correct_index = -1  # Posición de la respuesta correcta entre las opciones mostradas
         self.score = 0
         self.question_count = 0
         self.total_questions = 10 
@@ -39,10 +85,27 @@ class QuizApp(QWidget):
         # Variables para gestionar la lógica de Modo/Categoría
         self.current_game_mode = "TriviaClasica" 
         self.category_filter = "General" 
+
+        # Buffer de preguntas pre-generadas en segundo plano (ver _refill_buffer)
+        self._question_buffer = deque()
+        self._prefetch_in_flight = False
+        self._buffer_exhausted = False
+        self._prefetch_disabled = False
+        self._quiz_session = 0  # Descarta preguntas pedidas para un quiz anterior
+        self.prefetch_hits = 0
+        self.prefetch_misses = 0
+
+        # Feedback en línea (sin QMessageBox modal): resaltado + aviso temporal + avance automático
+        self.feedback_delay_ms = feedback_delay_ms
+        self._advance_timer = QTimer(self)
+        self._advance_timer.setSingleShot(True)
+        self._advance_timer.timeout.connect(self._auto_advance)
+        # Segundos que tardó el jugador en responder cada pregunta del quiz
+        self.response_times = []
+        self._question_shown_at = None
         
         # 1. Cargar el diseño .ui
-        loader = QUiLoader()
-        self.ui = loader.load(UI_FILE, self)
+        self.ui = load_ui(UI_FILE, self)
         
         if self.ui:
             # Configura el layout principal para contener el diseño cargado
@@ -56,8 +119,39 @@ class QuizApp(QWidget):
             return
 
         self.setStyleSheet("background-color: #2e2e2e;")
+        # Va en la raíz del .ui: su regla 'QWidget {...}' tendría prioridad sobre una hoja de un ancestro
+        self.ui.setStyleSheet(self.ui.styleSheet() + QUIZ_STYLESHEET)
+        self._create_feedback_overlay()
         self.toggle_options(False)
 
+    def _create_feedback_overlay(self):
+        """Aviso flotante sobre la vista con el resultado de la respuesta (no bloquea el event loop)."""
+        self.feedback_overlay = QLabel(self.ui)
+        self.feedback_overlay.setObjectName('feedback_overlay')
+        self.feedback_overlay.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.feedback_overlay.setWordWrap(True)
+        self.feedback_overlay.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.feedback_overlay.hide()
+
+    def _show_feedback_overlay(self, text: str, is_correct: bool):
+        self._set_style_state(self.feedback_overlay, 'result', "correct" if is_correct else "wrong")
+        self.feedback_overlay.setText(text)
+        width = int(self.width() * 0.6)
+        self.feedback_overlay.setFixedWidth(width)
+        self.feedback_overlay.adjustSize()
+        self.feedback_overlay.move((self.width() - width) // 2, (self.height() - self.feedback_overlay.height()) // 2)
+        self.feedback_overlay.raise_()
+        self.feedback_overlay.show()
+
+    def _hide_feedback(self):
+        self._advance_timer.stop()
+        self.feedback_overlay.hide()
+
+    def _auto_advance(self):
+        """Fin del tiempo de feedback: pasa a la siguiente pregunta (o termina el quiz)."""
+        self.feedback_overlay.hide()
+        self.next_question()
+
     def _find_ui_widgets(self):
         """Busca y asigna los widgets cargados del .ui a variables de instancia."""
         # Estos objectName DEBEN coincidir con los del archivo quiz_app.ui
@@ -68,13 +162,32 @@ class QuizApp(QWidget):
         
         # Busca los 4 botones de opción por sus objectNames
         self.option_buttons = []
+        # Las señales se conectan UNA vez: el grupo informa el índice del botón pulsado
+        self.option_group = QButtonGroup(self)
+        self.option_group.setExclusive(False)
         for i in range(4):
             btn = self.ui.findChild(QPushButton, f'option_btn_{i}')
             if btn:
+                self.option_group.addButton(btn, len(self.option_buttons))
                 self.option_buttons.append(btn)
+        self.option_group.idClicked.connect(self.check_answer)
+
+        if self.control_button:
+            self.control_button.clicked.connect(self.next_question)
             
     # Estilos y Toggles  
 
+    @staticmethod
+    def _set_style_state(widget, name: str, value: str):
+        """Cambia una propiedad de estilo y re-pule solo ese widget (sin volver a parsear QSS)."""
+        if widget.property(name) == value:
+            return
+        widget.setProperty(name, value)
+        style = widget.style()
+        style.unpolish(widget)
+        style.polish(widget)
+        widget.update()
+
     def toggle_options(self, enable):
         """Habilita/Deshabilita los botones de opción."""
         for btn in self.option_buttons:
@@ -82,22 +195,9 @@ class QuizApp(QWidget):
             if enable:
                 self._set_default_button_style(btn)
     
-    #  Esta función DEBE sobreescribir el estilo del .ui para funcionar correctamente
     def _set_default_button_style(self, btn):
-        """Estilo base para los botones de opción."""
-        btn.setStyleSheet("""
-            QPushButton {
-                padding: 12px; 
-                font-size: 16px;
-                border: none;
-                border-radius: 4px;
-                background-color: #555555;
-                color: white;
-            }
-            QPushButton:hover {
-                background-color: #666666;
-            }
-        """)
+        """Estilo base para los botones de opción (quita el resaltado de la respuesta)."""
+        self._set_style_state(btn, 'answer', "none")
 
     # start_quiz ahora recibe los parámetros del juego
     def start_quiz(self, category="General", game_mode="TriviaClasica"):
@@ -112,10 +212,26 @@ class QuizApp(QWidget):
         self.current_game_mode = game_mode
         self.score = 0
         self.question_count = 0
+
+        self._quiz_session += 1
+        self._hide_feedback()
+        self.response_times = []
+        self._question_shown_at = None
+        self._question_buffer.clear()
+        self._prefetch_in_flight = False
+        self._buffer_exhausted = False
+        self._prefetch_disabled = False
+        self.prefetch_hits = 0
+        self.prefetch_misses = 0
         
         if self.quiz_generator:
             self.quiz_generator.reset_used_questions()
-            
+            available = self.quiz_generator.remaining_questions(category)
+            if available < self.total_questions:
+                logger.warning(f"La categoría '{category}' solo tiene {available} preguntas; se completará con 'General'.")
+            # La primera pregunta se genera mientras se muestra la pantalla de inicio
+            self._refill_buffer()
+
         if self.score_label:
             self.score_label.setText(f"Puntuación: 0/{self.total_questions}")
         
@@ -123,19 +239,12 @@ class QuizApp(QWidget):
         
         if self.question_label:
             self.question_label.setText(f"¡Modo: {mode_display} ({self.total_questions} preguntas)! Presiona para empezar.")
-            self.question_label.setStyleSheet("font-size: 24px; margin: 20px 0; padding: 15px; background-color: #007bff; color: white; border-radius: 5px;")
+            self._set_style_state(self.question_label, 'state', "intro")
         
         if self.control_button:
             self.control_button.setText("Comenzar Quiz") 
-            self.control_button.setStyleSheet("background-color: #28a745; color: white; padding: 18px; font-size: 20px; margin-top: 30px; border-radius: 8px;")
+            self._set_style_state(self.control_button, 'state', "start")
             self.control_button.setEnabled(True)
-            
-            try:
-                self.control_button.clicked.disconnect()
-            except TypeError: 
-                pass
-            
-            self.control_button.clicked.connect(self.next_question)
         logger.info(f"Quiz preparado: Modo={game_mode}, Categoría={category}")
 
 
@@ -148,6 +257,8 @@ class QuizApp(QWidget):
             
         if self.control_button:
             self.control_button.setEnabled(False)
+        # Si el jugador avanza antes de tiempo, se cancela el avance automático pendiente
+        self._hide_feedback()
         
         if self.quiz_generator is None:
             logger.error("Intentando llamar a next_question sin QuizGenerator.")
@@ -161,28 +272,25 @@ class QuizApp(QWidget):
         
         self.question_count += 1
         
-        current_question = self.quiz_generator.get_random_question(category=self.category_filter) 
+        current_question = self._take_question()
         self.current_question = current_question
+        self._refill_buffer()
         
         if self.current_question and self.question_label:
-            question_text = self.current_question['question'].replace('**', '<b>', 1).replace('**', '</b>', 1)
+            question_text = self.current_question.question.replace('**', '<b>', 1).replace('**', '</b>', 1)
             self.question_label.setText(f"Pregunta {self.question_count}: {question_text}")
-            self.question_label.setStyleSheet("font-size: 24px; margin: 20px 0; padding: 15px; background-color: #444444; color: white; border-radius: 5px;")
+            self._set_style_state(self.question_label, 'state', "question")
             
-            for i, option in enumerate(self.current_question['options']):
-                if i < len(self.option_buttons):
-                    btn = self.option_buttons[i]
-                    btn.setText(option)
-                    self._set_default_button_style(btn)
-                    
-                    try:
-                        btn.clicked.disconnect()
-                    except TypeError:
-                        pass
-                    
-                    btn.clicked.connect(lambda checked, text=option: self.check_answer(text)) 
+            options = self.current_question.options
+            self._correct_index = options.index(self.current_question.correct_answer)
+            for i, btn in enumerate(self.option_buttons):
+                # Si la pregunta trae menos de 4 opciones, los botones sobrantes se ocultan
+                btn.setVisible(i < len(options))
+                if i < len(options):
+                    btn.setText(options[i])
 
             self.toggle_options(True)
+            self._question_shown_at = time.perf_counter()
             if self.control_button:
                 self.control_button.setText("Siguiente Pregunta")
         else:
@@ -193,32 +301,88 @@ class QuizApp(QWidget):
                 self.control_button.setEnabled(True)
             self.end_quiz()
 
-    def check_answer(self, selected_option_text):
-        """Verifica si la opción seleccionada es correcta."""
+    #  PREFETCH: la próxima pregunta se genera mientras el jugador responde la actual
+
+    def _take_question(self):
+        """Toma la próxima pregunta del buffer; si todavía no llegó, la genera en el momento."""
+        if self._question_buffer:
+            self.prefetch_hits += 1
+            return self._question_buffer.popleft()
+
+        self.prefetch_misses += 1
+        if self._buffer_exhausted:
+            return None
+        return self.quiz_generator.get_random_question(category=self.category_filter)
+
+    def _refill_buffer(self):
+        """Pide en segundo plano una pregunta más si el buffer no cubre lo que falta del quiz."""
+        if self._prefetch_in_flight or self._buffer_exhausted or self._prefetch_disabled or not self.quiz_generator:
+            return
+        still_needed = self.total_questions - self.question_count
+        if len(self._question_buffer) >= min(PREFETCH_SIZE, still_needed):
+            return
+
+        self._prefetch_in_flight = True
+        session = self._quiz_session
+        run_in_background(
+            self.quiz_generator.get_random_question, category=self.category_filter,
+            on_result=lambda question: self._on_question_prefetched(question, session),
+            on_error=lambda message: self._on_prefetch_error(message, session),
+        )
+
+    def _on_question_prefetched(self, question, session: int):
+        if session != self._quiz_session:
+            return  # Pregunta de un quiz anterior
+        self._prefetch_in_flight = False
+        if question is None:
+            # No quedan preguntas: el próximo 'Siguiente' termina el quiz
+            self._buffer_exhausted = True
+            return
+        self._question_buffer.append(question)
+        self._refill_buffer()
+
+    def _on_prefetch_error(self, message: str, session: int):
+        if session != self._quiz_session:
+            return
+        # Sin prefetch, next_question genera las preguntas en el momento
+        self._prefetch_in_flight = False
+        self._prefetch_disabled = True
+        logger.error(f"Prefetch de preguntas desactivado para este quiz: {message}")
+
+    def check_answer(self, selected_index: int):
+        """Verifica por posición si la opción seleccionada (id del botón en option_group) es la correcta."""
         self.toggle_options(False)
         if self.control_button:
             self.control_button.setEnabled(True)
         
-        correct_answer = self.current_question['correct_answer']
-        is_correct = (selected_option_text == correct_answer)
+        if self._question_shown_at is not None:
+            self.response_times.append(time.perf_counter() - self._question_shown_at)
+            self._question_shown_at = None
+        
+        correct_answer = self.current_question.correct_answer
+        is_correct = (selected_index == self._correct_index)
 
         if is_correct:
             self.score += 1
-            QMessageBox.information(self, "¡Correcto!", "¡Respuesta correcta! Ganaste un punto.")
+            self._show_feedback_overlay("¡Correcto! Ganaste un punto.", True)
         else:
-            QMessageBox.critical(self, "Incorrecto", f"Respuesta incorrecta. La respuesta correcta era: {correct_answer}")
+            self._show_feedback_overlay(f"Incorrecto. La respuesta correcta era: {correct_answer}", False)
 
         if self.score_label:
             self.score_label.setText(f"Puntuación: {self.score}/{self.total_questions}")
-        self.highlight_answer(selected_option_text, correct_answer)
+        self.highlight_answer(selected_index, self._correct_index)
 
-    def highlight_answer(self, selected, correct):
-        """Colorea los botones para dar feedback."""
-        for btn in self.option_buttons:
-            if btn.text() == correct:
-                btn.setStyleSheet("background-color: #28a745; color: white; padding: 12px; font-size: 16px; border-radius: 4px;")
-            elif btn.text() == selected:
-                btn.setStyleSheet("background-color: #dc3545; color: white; padding: 12px; font-size: 16px; border-radius: 4px;")
+        # Avance automático: el quiz dura un tiempo predecible (el botón permite adelantarse)
+        if self.feedback_delay_ms:
+            self._advance_timer.start(self.feedback_delay_ms)
+
+    def highlight_answer(self, selected: int, correct: int):
+        """Colorea los botones (por índice) para dar feedback."""
+        for i, btn in enumerate(self.option_buttons):
+            if i == correct:
+                self._set_style_state(btn, 'answer', "correct")
+            elif i == selected:
+                self._set_style_state(btn, 'answer', "wrong")
             else:
                 self._set_default_button_style(btn)
 
@@ -226,10 +390,20 @@ class QuizApp(QWidget):
         """Muestra un mensaje de fin de quiz, oculta el botón de control y emite la señal de guardado."""
         if self.question_label:
             self.question_label.setText("Quiz Terminado. Procesando resultados...")
-            self.question_label.setStyleSheet("font-size: 24px; margin: 20px 0; padding: 15px; background-color: #f0ad4e; color: white; border-radius: 5px;")
+            self._set_style_state(self.question_label, 'state', "finished")
         
         self.toggle_options(False)
         if self.control_button:
             self.control_button.setVisible(False)
+
+        if self.response_times:
+            logger.info(f"Tiempo de respuesta: media {statistics.mean(self.response_times):.2f} s, "
+                        f"mediana {statistics.median(self.response_times):.2f} s, "
+                        f"máximo {max(self.response_times):.2f} s ({len(self.response_times)} respuestas).")
+
+        served = self.prefetch_hits + self.prefetch_misses
+        if served:
+            logger.info(f"Prefetch de preguntas: {self.prefetch_hits} aciertos, {self.prefetch_misses} fallos "
+                        f"({self.prefetch_hits / served:.0%} servidas desde el buffer).")
         
         self.quiz_finished.emit(self.score)
\ No newline at end of file
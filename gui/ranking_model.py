@@ -0,0 +1,150 @@
+# gui/ranking_model.py
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, Signal
+import numpy as np
+import pandas as pd
+import logging
+from gui.workers import run_in_background
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# ----------------------------------------------------------------------
+# CONFIGURACIÓN DEL MODELO DE RANKING
+# ----------------------------------------------------------------------
+RANKING_PAGE_SIZE = 50  # Filas pedidas a la DB por cada fetchMore
+
+# (título de la columna, columna del DataFrame)
+RANKING_COLUMNS = [
+    ('NOMBRE', 'player_name'),
+    ('PUNTUACIÓN', 'score'),
+    ('PREGUNTAS', 'total_questions'),
+    ('MODO', 'game_mode'),
+    ('FECHA', 'date_played'),
+]
+NUMERIC_COLUMNS = {1, 2}
+
+
+class RankingTableModel(QAbstractTableModel):
+    """
+    Modelo del ranking sobre arreglos por columna (ya formateados como texto).
+    Cada página se convierte de una sola vez (fechas vectorizadas) y se agrega al final;
+    las páginas siguientes se piden con fetch_leaderboard (keyset) cuando la vista
+    llega al final de las filas cargadas (canFetchMore/fetchMore).
+    """
+    page_loaded = Signal(int)   # Filas nuevas agregadas (0 = ranking vacío)
+    load_failed = Signal(str)
+
+    def __init__(self, page_size: int = RANKING_PAGE_SIZE, parent=None):
+        super().__init__(parent)
+        self.page_size = page_size
+        self.db_manager = None
+        self.filters = {}
+        self._columns = [np.empty(0, dtype=object) for _ in RANKING_COLUMNS]
+        self._row_count = 0
+        self._next_cursor = None
+        self._has_more = False
+        self._fetching = False
+        # Cada reset invalida las páginas en vuelo de la carga anterior
+        self._generation = 0
+
+    # --- Carga de datos ---
+
+    def reset(self, db_manager, game_mode: str = None, period: str = 'all', order_by: str = 'score',
+              min_ratio: float = None):
+        """Vacía el modelo y pide la primera página con los filtros dados."""
+        self.beginResetModel()
+        self._columns = [np.empty(0, dtype=object) for _ in RANKING_COLUMNS]
+        self._row_count = 0
+        self.endResetModel()
+
+        self.db_manager = db_manager
+        self.filters = {'game_mode': game_mode, 'period': period, 'order_by': order_by, 'min_ratio': min_ratio}
+        self._generation += 1
+        self._next_cursor = None
+        self._has_more = True
+        self._fetching = False
+        self._request_page()
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        if parent.isValid():
+            return False
+        return self._has_more and not self._fetching and self._row_count > 0
+
+    def fetchMore(self, parent=QModelIndex()):
+        if self.canFetchMore(parent):
+            self._request_page()
+
+    def _request_page(self):
+        if not self.db_manager:
+            return
+        self._fetching = True
+        generation = self._generation
+        run_in_background(
+            self.db_manager.fetch_leaderboard, limit=self.page_size, cursor=self._next_cursor, **self.filters,
+            on_result=lambda page: self._append_page(page, generation),
+            on_error=lambda message: self._on_page_error(message, generation),
+        )
+
+    def _on_page_error(self, message: str, generation: int):
+        if generation != self._generation:
+            return
+        self._fetching = False
+        self._has_more = False
+        self.load_failed.emit(message)
+
+    def _append_page(self, page, generation: int):
+        """Agrega una página (DataFrame, next_cursor) recibida del hilo de trabajo."""
+        if generation != self._generation:
+            return  # Respuesta de una carga anterior
+        df, next_cursor = page
+        self._fetching = False
+        self._next_cursor = next_cursor
+        self._has_more = next_cursor is not None
+
+        new_columns = self._format_page(df)
+        added = len(df)
+        if added:
+            self.beginInsertRows(QModelIndex(), self._row_count, self._row_count + added - 1)
+            self._columns = [np.concatenate((old, new)) for old, new in zip(self._columns, new_columns)]
+            self._row_count += added
+            self.endInsertRows()
+        self.page_loaded.emit(added)
+
+    @staticmethod
+    def _format_page(df: pd.DataFrame) -> list:
+        """Convierte la página a texto columna por columna (una pasada vectorizada por columna)."""
+        if df.empty:
+            return [np.empty(0, dtype=object) for _ in RANKING_COLUMNS]
+
+        dates = pd.to_datetime(df['date_played'], errors='coerce').dt.strftime('%Y-%m-%d %H:%M')
+        formatted = {
+            'player_name': df['player_name'].astype(str),
+            'score': df['score'].astype(str),
+            'total_questions': df['total_questions'].astype(str),
+            'game_mode': df['game_mode'].astype(str),
+            'date_played': dates.fillna(df['date_played'].astype(str)),
+        }
+        return [formatted[column].to_numpy(dtype=object) for _, column in RANKING_COLUMNS]
+
+    # --- Interfaz de QAbstractTableModel ---
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._row_count
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(RANKING_COLUMNS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._columns[index.column()][index.row()]
+        if role == Qt.ItemDataRole.TextAlignmentRole and index.column() in NUMERIC_COLUMNS:
+            return int(Qt.AlignmentFlag.AlignCenter)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return RANKING_COLUMNS[section][0]
+        return None
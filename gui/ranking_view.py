@@ -1,14 +1,14 @@
 # gui/ranking_view.py 
 
 from PySide6.QtWidgets import (
-    QWidget, QTableWidget, QTableWidgetItem, QVBoxLayout, 
+    QWidget, QTableView, QVBoxLayout, 
     QPushButton, QLabel, QHeaderView
 )
-from PySide6.QtUiTools import QUiLoader
+from gui.ui_loader import load_ui  # Usa el .ui precompilado si está disponible
 from PySide6.QtCore import Signal, Qt
-import pandas as pd
 import os
 import logging
+from gui.ranking_model import RankingTableModel
 
 # Define la ruta relativa al archivo .ui que crearás en Qt Designer
 UI_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'ui', 'ranking_view.ui')
@@ -27,8 +27,7 @@ class RankingView(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
        
-        loader = QUiLoader()
-        self.ui = loader.load(UI_FILE, self)
+        self.ui = load_ui(UI_FILE, self)
         
         if self.ui:
             layout = QVBoxLayout(self)
@@ -39,18 +38,30 @@ class RankingView(QWidget):
             return
 
         # 2. Encuentra los widgets 
-        self.ranking_table = self.ui.findChild(QTableWidget, 'ranking_table')
+        self.ranking_table = self.ui.findChild(QTableView, 'ranking_table')
         self.back_button = self.ui.findChild(QPushButton, 'btn_volver')
 
         # 3. Conexión y Aplicación de Estilos
         if self.back_button:
             self.back_button.clicked.connect(self.back_to_menu.emit)
         
+        # El modelo pide las páginas a la DB a medida que se hace scroll (fetchMore)
+        self.ranking_model = RankingTableModel(parent=self)
+        self.ranking_model.page_loaded.connect(self._on_page_loaded)
+        self.ranking_model.load_failed.connect(self._on_ranking_error)
+
         if self.ranking_table:
-            self.ranking_table.setColumnCount(5) 
-            self.ranking_table.setHorizontalHeaderLabels(['NOMBRE', 'Puntuación', 'Preguntas', 'Modo', 'Fecha'])
+            self.ranking_table.setModel(self.ranking_model)
             self._setup_table_style()
 
+        # Indicador de carga (la consulta corre en segundo plano)
+        self.status_label = QLabel("")
+        self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.status_label.setStyleSheet("color: #ffc107; font-size: 16px;")
+        self.status_label.setVisible(False)
+        if self.ui.layout():
+            self.ui.layout().insertWidget(1, self.status_label)
+
 
     def _setup_table_style(self):
         """Aplica estilos QSS y configuración final a la tabla."""
@@ -59,7 +70,7 @@ class RankingView(QWidget):
         
         # ESTILOS QSS (Esto hace visible el texto)
         self.ranking_table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 background-color: #444444; 
                 gridline-color: #555555;
                 color: white; /* ESTO HACE EL TEXTO VISIBLE */
@@ -72,7 +83,7 @@ class RankingView(QWidget):
                 padding: 5px; 
                 font-weight: bold;
             }
-            QTableWidget::item:alternate {
+            QTableView::item:alternate {
                 background-color: #3a3a3a; /* Color de las filas pares */
             }
         """)
@@ -87,46 +98,29 @@ class RankingView(QWidget):
     # --- CORRECCIÓN 2: RECIBIR db_manager COMO ARGUMENTO ---
     # Esto soluciona el error "takes 1 positional argument but 2 were given"
     def load_ranking_data(self, db_manager):
-        """Carga y muestra los datos del ranking desde la DB (Llamado desde MainWindow al navegar)."""
+        """
+        Recarga el ranking desde la primera página (Llamado desde MainWindow al navegar).
+        Las consultas corren en segundo plano; la tabla se actualiza al llegar cada página.
+        """
         if not self.ranking_table or not db_manager: 
             logger.warning("RankingView: No se puede cargar el ranking (tabla nula o DBManager no suministrado).")
             return
 
         logger.info("RankingView: Solicitando datos de ranking...")
-        
-        # 1. Obtener datos del ranking usando el argumento db_manager
-        df = db_manager.fetch_top_scores(limit=15)
-        
-        # 2. Limpiar la tabla antes de llenarla
-        self.ranking_table.clearContents()
-        self.ranking_table.setRowCount(df.shape[0])
+        self._set_status("Cargando ranking...")
+        self.ranking_model.reset(db_manager)
 
-        if df.empty:
-            logger.info("RankingView: No hay datos en el ranking.")
-            return
+    def _set_status(self, message: str):
+        self.status_label.setText(message)
+        self.status_label.setVisible(bool(message))
+
+    def _on_ranking_error(self, message: str):
+        self._set_status(f"No se pudo cargar el ranking: {message}")
 
-        # 3. Llenar la tabla fila por fila 
-        for row_index, row_data in df.iterrows():
-            date_str = pd.to_datetime(row_data['date_played']).strftime('%Y-%m-%d %H:%M')
-            
-            # Columna 0: NOMBRE 
-            self.ranking_table.setItem(row_index, 0, QTableWidgetItem(row_data['player_name'])) 
-            
-            # Columna 1: Puntuación
-            self.ranking_table.setItem(row_index, 1, QTableWidgetItem(str(row_data['score']))) 
-            
-            # Columna 2: Preguntas
-            self.ranking_table.setItem(row_index, 2, QTableWidgetItem(str(row_data['total_questions'])))
-            
-            # Columna 3: Modo
-            self.ranking_table.setItem(row_index, 3, QTableWidgetItem(row_data['game_mode']))
-            
-            # Columna 4: Fecha
-            self.ranking_table.setItem(row_index, 4, QTableWidgetItem(date_str))
-
-        # 4. Ajustar columnas y refrescar visualmente
-        self.ranking_table.resizeColumnsToContents()
-        self.ranking_table.viewport().update()
-        self.ranking_table.repaint()
-
-        logger.info(f"RankingView: Tabla actualizada con {len(df)} registros.")
\ No newline at end of file
+    def _on_page_loaded(self, added: int):
+        self._set_status("")
+        total = self.ranking_model.rowCount()
+        if total == 0:
+            logger.info("RankingView: No hay datos en el ranking.")
+        else:
+            logger.info(f"RankingView: {added} registros agregados ({total} en total).")
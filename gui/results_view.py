@@ -1,7 +1,7 @@
 # gui/results_view.py 
 
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QLineEdit, QMessageBox
-from PySide6.QtUiTools import QUiLoader
+from gui.ui_loader import load_ui  # Usa el .ui precompilado si está disponible
 from PySide6.QtCore import Signal, Qt
 
 import os
@@ -27,16 +27,18 @@ class ResultsView(QWidget):
     _score = 0
     _total = 0
     _mode = ""
+    _pending_player_name = ""
 
     #  ELIMINAR DB_MANAGER DEL CONSTRUCTOR 
     def __init__(self, parent=None): 
         super().__init__(parent)
         # self.db_manager ya no existe
-        self.score_saved = False # Flag para evitar guardar dos veces
+        self.score_saved = False # Flag para evitar guardar dos veces (True solo tras el commit)
+        self.save_pending = False # Petición enviada, esperando la confirmación del escritor
+        self._after_save = None # Señal de navegación a emitir cuando se confirme el guardado
         
         # 1. Carga el diseño visual 
-        loader = QUiLoader()
-        self.ui = loader.load(UI_FILE, self)
+        self.ui = load_ui(UI_FILE, self)
         
         if self.ui:
             layout = QVBoxLayout(self)
@@ -83,6 +85,8 @@ class ResultsView(QWidget):
         self._total = total
         self._mode = mode
         self.score_saved = False 
+        self.save_pending = False
+        self._after_save = None
 
         mode_text = "CLÁSICA" if "Clasica" in mode else "TEMÁTICA"
         
@@ -106,6 +110,8 @@ class ResultsView(QWidget):
         if self.score_saved:
             QMessageBox.information(self, "Ya Guardado", "Tu puntuación ya ha sido guardada en el ranking.")
             return
+        if self.save_pending:
+            return # Ya se pidió; falta la confirmación
 
         player_name = self.name_entry.text().strip()
         
@@ -116,38 +122,64 @@ class ResultsView(QWidget):
 
         #  EMITIR LA SEÑAL EN LUGAR DE GUARDAR DIRECTAMENTE 
         try:
+            self.save_pending = True
+            self._pending_player_name = player_name
+            self.name_entry.setEnabled(False) # Deshabilita la entrada mientras se guarda
+            self.name_entry.setText(f"{player_name} (Guardando...)")
             self.save_score_requested.emit(
                 player_name, 
                 self._score, 
                 self._total, 
                 self._mode
             )
-            # Asumimos que si la señal fue emitida, el guardado será exitoso
-            self.score_saved = True
-            self.name_entry.setEnabled(False) # Deshabilita la entrada una vez guardado
-            self.name_entry.setText(f"{player_name} (Puntaje Guardado)")
             logger.info(f"Petición de score enviada para {player_name}: {self._score}/{self._total} | Modo: {self._mode}")
-            QMessageBox.information(self, "¡Éxito!", f"¡{player_name}, tu puntuación ha sido registrada! (Guardado manejado por el Controlador)")
 
         except Exception as e:
             # Esta excepción es para el proceso de emitir la señal, NO para la DB
+            self.save_pending = False
+            self.name_entry.setEnabled(True)
+            self.name_entry.setText(player_name)
             logger.error(f"Error al emitir la señal de guardado: {e}")
             QMessageBox.critical(self, "Error de Señal", "Ocurrió un error al intentar solicitar el guardado.")
 
+    def on_score_saved(self, ok: bool, error_message: str = ""):
+        """Llamado por MainWindow cuando el escritor confirma (o no) el commit del puntaje."""
+        self.save_pending = False
+        player_name = self._pending_player_name
+        after_save, self._after_save = self._after_save, None
 
-    def _save_score_and_show_ranking(self):
-        """Intenta guardar el score y luego pide navegar al ranking."""
-        if not self.score_saved:
+        if not ok:
+            self.name_entry.setEnabled(True)
+            self.name_entry.setText(player_name)
+            QMessageBox.warning(self, "Error de Guardado", f"No se pudo guardar el puntaje: {error_message}")
+            return
+
+        self.score_saved = True
+        self.name_entry.setText(f"{player_name} (Puntaje Guardado)")
+
+        if after_save:
+            after_save.emit() # Navegación pedida mientras se guardaba
+        else:
+            QMessageBox.information(self, "¡Éxito!", f"¡{player_name}, tu puntuación ha sido registrada!")
+
+
+    def _save_score_and_navigate(self, navigation_signal):
+        """Navega de inmediato si ya está guardado; si no, pide el guardado y navega al confirmarse."""
+        if self.score_saved:
+            navigation_signal.emit()
+            return
+
+        if not self.save_pending:
             self._save_current_score()
         
-        # Solo navegamos si el guardado se completó o fue solicitado (self.score_saved = True)
-        if self.score_saved:
-            self.show_ranking_request.emit()
+        # Solo navegamos cuando el escritor confirme el guardado
+        if self.save_pending:
+            self._after_save = navigation_signal
+
+    def _save_score_and_show_ranking(self):
+        """Intenta guardar el score y luego pide navegar al ranking."""
+        self._save_score_and_navigate(self.show_ranking_request)
 
     def _save_score_and_go_menu(self):
         """Intenta guardar el score y luego pide navegar al menú principal."""
-        if not self.score_saved:
-            self._save_current_score()
-
-        if self.score_saved:
-            self.back_to_menu_request.emit()
\ No newline at end of file
+        self._save_score_and_navigate(self.back_to_menu_request)
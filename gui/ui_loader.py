@@ -0,0 +1,139 @@
+# gui/ui_loader.py
+
+from PySide6.QtWidgets import QWidget
+from PySide6.QtUiTools import QUiLoader
+import importlib.util
+import subprocess
+import shutil
+import logging
+import os
+import re
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# ----------------------------------------------------------------------
+# CONFIGURACIÓN DEL CACHÉ DE .ui COMPILADOS
+# ----------------------------------------------------------------------
+UI_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'ui')
+# Módulos generados por pyside6-uic (no se versionan; ver .gitignore)
+COMPILED_UI_DIR = os.path.join(UI_DIR, '_compiled')
+UIC_COMMAND = 'pyside6-uic'
+UIC_TIMEOUT_SECONDS = 30
+
+# Primera línea del módulo generado: mtime del .ui del que salió (detecta cambios en ambos sentidos)
+MTIME_HEADER = "# ui-source-mtime-ns: {mtime_ns}\n"
+MTIME_HEADER_RE = re.compile(r"# ui-source-mtime-ns: (\d+)")
+
+# Módulos ya importados en esta sesión: ruta del .ui -> (mtime_ns, módulo)
+_loaded_modules = {}
+
+
+def _compiled_path(ui_file: str) -> str:
+    name = os.path.splitext(os.path.basename(ui_file))[0]
+    return os.path.join(COMPILED_UI_DIR, f"ui_{name}.py")
+
+
+def _compiled_mtime(compiled_file: str):
+    """mtime del .ui registrado en la cabecera del módulo generado (None si no existe o no es legible)."""
+    try:
+        with open(compiled_file, encoding='utf-8') as f:
+            match = MTIME_HEADER_RE.match(f.readline())
+    except OSError:
+        return None
+    return int(match.group(1)) if match else None
+
+
+def compile_ui(ui_file: str, force: bool = False) -> bool:
+    """
+    Genera el módulo Python del .ui con pyside6-uic si no existe o si el .ui cambió.
+    Devuelve True si el módulo quedó al día.
+    """
+    compiled_file = _compiled_path(ui_file)
+    mtime_ns = os.stat(ui_file).st_mtime_ns
+    if not force and _compiled_mtime(compiled_file) == mtime_ns:
+        return True
+
+    uic = shutil.which(UIC_COMMAND)
+    if not uic:
+        logger.debug(f"{UIC_COMMAND} no está disponible; se usará QUiLoader para {os.path.basename(ui_file)}.")
+        return False
+
+    try:
+        result = subprocess.run([uic, ui_file], capture_output=True, text=True,
+                                encoding='utf-8', timeout=UIC_TIMEOUT_SECONDS)
+    except (OSError, subprocess.SubprocessError) as e:
+        logger.warning(f"No se pudo ejecutar {UIC_COMMAND} para {os.path.basename(ui_file)}: {e}")
+        return False
+    if result.returncode != 0:
+        logger.warning(f"{UIC_COMMAND} falló con {os.path.basename(ui_file)}: {result.stderr.strip()}")
+        return False
+
+    # Escritura atómica: otro proceso nunca ve un módulo a medio escribir
+    os.makedirs(COMPILED_UI_DIR, exist_ok=True)
+    tmp_file = f"{compiled_file}.{os.getpid()}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        f.write(MTIME_HEADER.format(mtime_ns=mtime_ns))
+        f.write(result.stdout)
+    os.replace(tmp_file, compiled_file)
+    logger.info(f"Compilado {os.path.basename(ui_file)} -> {os.path.relpath(compiled_file, UI_DIR)}")
+    return True
+
+
+def compile_all(force: bool = False) -> int:
+    """Paso de build opcional: compila todos los .ui de UI_DIR. Devuelve cuántos quedaron al día."""
+    ui_files = sorted(f for f in os.listdir(UI_DIR) if f.endswith('.ui'))
+    return sum(compile_ui(os.path.join(UI_DIR, f), force=force) for f in ui_files)
+
+
+def _import_compiled(ui_file: str):
+    """Importa (o reutiliza) el módulo generado del .ui, compilándolo antes si está desactualizado."""
+    mtime_ns = os.stat(ui_file).st_mtime_ns
+    cached = _loaded_modules.get(ui_file)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+
+    if not compile_ui(ui_file):
+        return None
+
+    compiled_file = _compiled_path(ui_file)
+    module_name = f"ui_compiled.{os.path.splitext(os.path.basename(compiled_file))[0]}"
+    spec = importlib.util.spec_from_file_location(module_name, compiled_file)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    _loaded_modules[ui_file] = (mtime_ns, module)
+    return module
+
+
+def load_ui(ui_file: str, parent: QWidget = None):
+    """
+    Reemplazo de QUiLoader().load(ui_file, parent): construye el widget con el módulo
+    compilado (sin parsear XML) y recurre a QUiLoader si no hay compilado posible.
+    Devuelve None si el .ui no existe, igual que QUiLoader.
+    """
+    if not os.path.exists(ui_file):
+        return None
+
+    try:
+        module = _import_compiled(ui_file)
+        # uic genera una única clase Ui_<NombreDelFormulario> con setupUi(widget)
+        form_class = next((getattr(module, attr) for attr in dir(module) if attr.startswith('Ui_')), None) if module else None
+    except Exception as e:
+        logger.warning(f"Módulo compilado de {os.path.basename(ui_file)} inutilizable ({e}); se usa QUiLoader.")
+        form_class = None
+
+    if form_class is None:
+        return QUiLoader().load(ui_file, parent)
+
+    # Todos los formularios del proyecto tienen un QWidget como raíz
+    widget = QWidget(parent)
+    form = form_class()
+    form.setupUi(widget)
+    widget._ui_form = form  # Mantiene vivas las referencias que guarda setupUi
+    return widget
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    compiled = compile_all(force=True)
+    logger.info(f"{compiled} archivos .ui compilados en {COMPILED_UI_DIR}")
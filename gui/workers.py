@@ -0,0 +1,64 @@
+# gui/workers.py
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+import logging
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+class TaskSignals(QObject):
+    """
+    Señales de una tarea en segundo plano. El objeto vive en el hilo de la GUI,
+    así que los slots conectados se ejecutan en la GUI aunque la tarea emita desde el pool.
+    """
+    result = Signal(object)
+    error = Signal(str)
+    finished = Signal()
+
+
+class Task(QRunnable):
+    """Ejecuta una función en el QThreadPool y publica su resultado o error por señales."""
+
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = TaskSignals()
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            logger.exception(f"Error en tarea en segundo plano ({getattr(self.fn, '__name__', self.fn)}): {e}")
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.result.emit(result)
+        finally:
+            self.signals.finished.emit()
+
+
+# Referencias a las tareas en curso: evita que Python libere las señales antes de entregarlas
+_active_tasks = set()
+
+
+def run_in_background(fn, *args, on_result=None, on_error=None, on_finished=None, **kwargs) -> Task:
+    """
+    Lanza fn(*args, **kwargs) en el QThreadPool global. Los callbacks reciben el resultado
+    (on_result), el mensaje de error (on_error) y el fin de la tarea (on_finished) en la GUI.
+    """
+    task = Task(fn, *args, **kwargs)
+    if on_result:
+        task.signals.result.connect(on_result)
+    if on_error:
+        task.signals.error.connect(on_error)
+    if on_finished:
+        task.signals.finished.connect(on_finished)
+
+    _active_tasks.add(task)
+    task.signals.finished.connect(lambda: _active_tasks.discard(task))
+    task.setAutoDelete(False)  # La vida de la tarea la maneja _active_tasks
+
+    QThreadPool.globalInstance().start(task)
+    return task
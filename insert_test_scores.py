@@ -3,6 +3,7 @@ from core.database_manager import DatabaseManager
 
 # Instancia del manager (asegúrate de que la ruta sea correcta)
 db_manager = DatabaseManager()
+db_manager.migrate_schema()  # Asegura la tabla Ranking sin cargar los CSV
 
 # Lista de puntajes de prueba
 test_scores = [
@@ -3,8 +3,10 @@
 import pandas as pd
 from functools import lru_cache 
 from datetime import datetime # Para la sugerencia del año dinámico
+from typing import Dict
 import logging 
-from core.database_manager import DatabaseManager 
+import time
+from core.database_manager import DatabaseManager, SEASON_START_MONTH
 
 # Configuración básica de logging para un mejor seguimiento
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -14,18 +16,30 @@ class DataAnalyzer:
     """
     Clase responsable de la consulta a la base de datos (DB) con caché y validación.
     Proporciona data analítica lista para usar por el QuizGenerator.
+    Las consultas leen la tabla pre-agregada player_season_stats (construida en la ingesta).
     """
     #  Conjunto de estadísticas válidas para validación de seguridad
     VALID_STATS = {"goals", "assists", "minutes_played", "yellow_cards", "red_cards", "appearances"}
 
-    def __init__(self):
-        self.db_manager = DatabaseManager()
-        self.latest_year = self.get_latest_data_year() 
+    def __init__(self, db_manager: DatabaseManager = None):
+        # DatabaseManager compartido (AppContext); se crea uno propio solo si no se recibe
+        self.db_manager = db_manager or DatabaseManager()
+        # (league_code, stat, limit) -> DataFrame; lo llenan get_top_performance_by_league(s)
+        self._league_performance_cache = {}
+        self.latest_year, latest_month = self._get_latest_data_year_month()
+        # Temporadas nombradas por su año de inicio (julio): 2023 = 2023/24.
+        # La temporada del último partido puede estar en curso; la última COMPLETA es la anterior.
+        latest_season = self.latest_year - (latest_month < SEASON_START_MONTH)
+        self.last_complete_season = latest_season - 1
 
     def get_latest_data_year(self) -> int:
         """Consulta la tabla APPEARANCES para encontrar el año más reciente disponible."""
+        return self._get_latest_data_year_month()[0]
+
+    def _get_latest_data_year_month(self):
+        """Año y mes del partido más reciente de APPEARANCES (una búsqueda por el índice de 'date')."""
         query = """
-        SELECT SUBSTR(date, 1, 4) AS Year FROM appearances
+        SELECT SUBSTR(date, 1, 4) AS Year, SUBSTR(date, 6, 2) AS Month FROM appearances
         ORDER BY date DESC
         LIMIT 1;
         """
@@ -33,12 +47,17 @@ class DataAnalyzer:
 
         if not result.empty:
             try:
-                return int(result.iloc[0]['Year'])
+                return int(result.iloc[0]['Year']), int(result.iloc[0]['Month'])
             except ValueError:
-                # Usar el año actual como fallback más seguro.
-                return datetime.now().year
-        else:
-            return datetime.now().year
+                pass
+        # Usar la fecha actual como fallback más seguro.
+        now = datetime.now()
+        return now.year, now.month
+
+    @staticmethod
+    def season_label(season: int) -> str:
+        """Nombre de la temporada para mostrar: 2023 -> '2023/24'."""
+        return f"{season}/{(season + 1) % 100:02d}"
 
 
     #  maxsize aumentado para cachear diferentes límites de Top Scorers
@@ -46,17 +65,16 @@ class DataAnalyzer:
     def get_top_scorers(self, limit: int = 100, min_goals: int = 100) -> pd.DataFrame:
         """Calcula y devuelve una lista de los máximos goleadores históricos."""
         
+        # Suma de temporadas ya agregadas: recorre player_season_stats, no cada aparición
         query = f"""
         SELECT
-            T1.player_id,
-            T2.name AS Player_Name,
-            SUM(T1.goals) AS Total_Goals
+            player_id,
+            MAX(player_name) AS Player_Name,
+            SUM(goals) AS Total_Goals
         FROM
-            appearances AS T1
-        INNER JOIN
-            players AS T2 ON T1.player_id = T2.player_id
+            player_season_stats
         GROUP BY
-            T1.player_id, T2.name
+            player_id
         HAVING
             Total_Goals >= ?
         ORDER BY
@@ -66,7 +84,7 @@ class DataAnalyzer:
         df = self.db_manager.query(query, params=(min_goals, limit))
         
         if df.empty: 
-            logger.warning("No se encontraron Top Scorers (Verifica la tabla 'appearances').")
+            logger.warning("No se encontraron Top Scorers (Verifica la tabla 'player_season_stats').")
             #  Devolver DF vacío con las columnas esperadas para evitar fallos de lógica.
             return pd.DataFrame(columns=["player_id", "Player_Name", "Total_Goals"])
         return df
@@ -88,8 +106,7 @@ class DataAnalyzer:
         return df
     
     
-    #  maxsize aumentado para cachear diferentes ligas
-    @lru_cache(maxsize=50) 
+    #  Caché explícito (no lru_cache): la consulta masiva lo llena de una vez para todas las ligas
     def get_top_performance_by_league(self, league_code: str, stat: str = 'goals', limit: int = 100) -> pd.DataFrame:
         """
         Calcula y devuelve los jugadores con mejor rendimiento para una liga específica 
@@ -100,28 +117,30 @@ class DataAnalyzer:
         if stat not in self.VALID_STATS:
             logger.error(f"Estadística no válida: '{stat}'. Se intentó usar 'goals' en su lugar.")
             stat = 'goals' # Fallback seguro
+
+        cache_key = (league_code, stat, limit)
+        if cache_key in self._league_performance_cache:
+            return self._league_performance_cache[cache_key]
             
-        target_season = self.latest_year - 1 
+        target_season = self.last_complete_season
         stat_column = stat # Ya validado como seguro
         
         # Stat_column debe inyectarse vía f-string ya que SQLite no permite placeholders para nombres de columnas.
+        # (competition_id, season) es un rango del índice de player_season_stats: no se agregan apariciones.
         query = f"""
         SELECT
-            T1.player_id,
-            T3.name AS Player_Name,
-            T2.name AS Club_Name,
-            SUM(T1.{stat_column}) AS Total_Stat
+            player_id,
+            player_name AS Player_Name,
+            club_name AS Club_Name,
+            SUM({stat_column}) AS Total_Stat
         FROM
-            appearances AS T1
-        INNER JOIN
-            clubs AS T2 ON T1.player_club_id = T2.club_id
-        INNER JOIN
-            players AS T3 ON T1.player_id = T3.player_id
+            player_season_stats
         WHERE
-            T2.domestic_competition_id = ? AND
-            T2.last_season = ?
+            competition_id = ? AND
+            season = ? AND
+            club_name IS NOT NULL
         GROUP BY
-            T1.player_id, T3.name, T2.name
+            player_id, club_id
         ORDER BY
             Total_Stat DESC
         LIMIT ?;
@@ -133,6 +152,91 @@ class DataAnalyzer:
         if df.empty: 
             logger.warning(f"No se encontró Top {stat.capitalize()} de {league_code} para {target_season}.")
             #  Devolver DF vacío con las columnas esperadas.
-            return pd.DataFrame(columns=["player_id", "Player_Name", "Club_Name", f"Total_{stat.capitalize()}"])
-            
-        return df.rename(columns={'Total_Stat': f'Total_{stat.capitalize()}'})
\ No newline at end of file
+            df = pd.DataFrame(columns=["player_id", "Player_Name", "Club_Name", f"Total_{stat.capitalize()}"])
+        else:
+            df = df.rename(columns={'Total_Stat': f'Total_{stat.capitalize()}'})
+
+        self._league_performance_cache[cache_key] = df
+        return df
+
+    def get_top_performance_by_leagues(self, league_codes, stats=('goals', 'assists'), limit: int = 100) -> Dict[str, Dict[str, pd.DataFrame]]:
+        """
+        Variante masiva de get_top_performance_by_league: UNA consulta agrega todas las
+        estadísticas de todas las ligas y ROW_NUMBER() rankea cada estadística dentro de cada liga.
+        Devuelve {stat: {league_code: DataFrame}} con el mismo formato que la versión por liga
+        y deja cada DataFrame en el caché, así las llamadas por liga posteriores no consultan la DB.
+        """
+        league_codes = list(dict.fromkeys(league_codes))
+        invalid = [stat for stat in stats if stat not in self.VALID_STATS]
+        if invalid:
+            logger.error(f"Estadísticas no válidas ignoradas: {invalid}.")
+        stats = [stat for stat in dict.fromkeys(stats) if stat in self.VALID_STATS]
+        if not league_codes or not stats:
+            return {stat: {} for stat in stats}
+
+        # Si todo está en caché no hace falta consultar
+        missing = [(league_code, stat) for stat in stats for league_code in league_codes
+                   if (league_code, stat, limit) not in self._league_performance_cache]
+        if missing:
+            self._fill_league_performance_cache(league_codes, stats, limit)
+
+        return {
+            stat: {league_code: self._league_performance_cache[(league_code, stat, limit)] for league_code in league_codes}
+            for stat in stats
+        }
+
+    def _fill_league_performance_cache(self, league_codes: list, stats: list, limit: int):
+        """Ejecuta la consulta única (GROUP BY + ROW_NUMBER por liga) y reparte el resultado en el caché."""
+        target_season = self.last_complete_season
+        # Las columnas vienen de VALID_STATS (validadas): se inyectan vía f-string
+        sum_columns = ",\n                ".join(f"SUM({stat}) AS {stat}" for stat in stats)
+        rank_columns = ",\n                ".join(
+            f"ROW_NUMBER() OVER (PARTITION BY competition_id ORDER BY {stat} DESC) AS rank_{stat}" for stat in stats
+        )
+        rank_filter = " OR ".join(f"rank_{stat} <= ?" for stat in stats)
+        placeholders = ", ".join("?" for _ in league_codes)
+
+        query = f"""
+        WITH totals AS (
+            SELECT
+                competition_id,
+                player_id,
+                player_name AS Player_Name,
+                club_name AS Club_Name,
+                {sum_columns}
+            FROM
+                player_season_stats
+            WHERE
+                competition_id IN ({placeholders}) AND
+                season = ? AND
+                club_name IS NOT NULL
+            GROUP BY
+                competition_id, player_id, club_id
+        ),
+        ranked AS (
+            SELECT
+                *,
+                {rank_columns}
+            FROM totals
+        )
+        SELECT * FROM ranked
+        WHERE {rank_filter};
+        """
+        params = (*league_codes, target_season, *([limit] * len(stats)))
+        start_time = time.time()
+        df = self.db_manager.query(query, params=params)
+        logger.info(f"Top {', '.join(stats)} de {len(league_codes)} ligas en una consulta ({len(df)} filas, {time.time() - start_time:.2f} s).")
+
+        by_league = dict(tuple(df.groupby('competition_id'))) if not df.empty else {}
+        for stat in stats:
+            value_column = f"Total_{stat.capitalize()}"
+            for league_code in league_codes:
+                league_df = by_league.get(league_code)
+                if league_df is None:
+                    logger.warning(f"No se encontró Top {stat.capitalize()} de {league_code} para {target_season}.")
+                    frame = pd.DataFrame(columns=["player_id", "Player_Name", "Club_Name", value_column])
+                else:
+                    top = league_df[league_df[f"rank_{stat}"] <= limit].sort_values(f"rank_{stat}")
+                    frame = top[["player_id", "Player_Name", "Club_Name", stat]].rename(columns={stat: value_column})
+                    frame = frame.reset_index(drop=True)
+                self._league_performance_cache[(league_code, stat, limit)] = frame
@@ -0,0 +1,210 @@
+# logic/question_bank.py
+
+import os
+import sys
+import pickle
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# ----------------------------------------------------------------------
+# CONFIGURACIÓN DE LOGGING
+# ----------------------------------------------------------------------
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+# ----------------------------------------------------------------------
+# SNAPSHOT BINARIO DEL BANCO
+# ----------------------------------------------------------------------
+# Subir la versión si cambia el formato del banco: los snapshots viejos se descartan solos
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SUFFIX = '.questions.snapshot'
+
+
+class Question:
+    """Registro liviano de una pregunta lista para mostrar (sin diccionario por instancia)."""
+
+    __slots__ = ('type', 'question', 'correct_answer', 'options', 'hint')
+
+    def __init__(self, type: str, question: str, correct_answer: str, options, hint: str = ""):
+        self.type = type
+        self.question = question
+        self.correct_answer = correct_answer
+        self.options = options
+        self.hint = hint
+
+    def __eq__(self, other):
+        if not isinstance(other, Question):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    def __repr__(self):
+        return f"Question(type={self.type!r}, question={self.question!r}, options={self.options!r})"
+
+
+class QuestionBank:
+    """
+    Banco de preguntas fijas en formato columnar (struct-of-arrays).
+    Se construye UNA vez al cargar el caché: textos internados, opciones ya separadas
+    y un índice categoría simplificada -> posiciones de fila (int32).
+    """
+
+    def __init__(self, questions: np.ndarray, correct_answers: np.ndarray,
+                 options: np.ndarray, types: np.ndarray,
+                 category_index: Dict[str, np.ndarray]):
+        self.questions = questions
+        self.correct_answers = correct_answers
+        self.options = options
+        self.types = types
+        self.category_index = category_index
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, prefix_mapping: Optional[Dict[str, str]] = None) -> "QuestionBank":
+        """Convierte el DataFrame de 'quiz_questions' al formato columnar."""
+        if df.empty:
+            return cls.empty_bank()
+
+        def interned(column: str) -> np.ndarray:
+            values = df[column].astype(str).str.strip().tolist()
+            return np.array([sys.intern(v) for v in values], dtype=object)
+
+        types = interned('Type')
+
+        # Las opciones se separan una sola vez; los distractores repetidos comparten el mismo objeto str
+        split_options = df['Options'].astype(str).str.split(';').tolist()
+        options = np.empty(len(split_options), dtype=object)
+        for i, raw_options in enumerate(split_options):
+            options[i] = tuple(sys.intern(opt.strip()) for opt in raw_options if opt.strip())
+
+        return cls(
+            questions=interned('Question'),
+            correct_answers=interned('Correct_Answer'),
+            options=options,
+            types=types,
+            category_index=cls._build_category_index(types, prefix_mapping or {}),
+        )
+
+    @classmethod
+    def empty_bank(cls) -> "QuestionBank":
+        """Banco sin preguntas (la tabla no existe o está vacía)."""
+        no_strings = np.empty(0, dtype=object)
+        return cls(no_strings, no_strings, no_strings, no_strings,
+                   {"General": np.empty(0, dtype=np.int32)})
+
+    @staticmethod
+    def _build_category_index(types: np.ndarray, prefix_mapping: Dict[str, str]) -> Dict[str, np.ndarray]:
+        """
+        Construye el índice categoría simplificada -> posiciones de fila (int32).
+        El prefijo es la parte de 'Type' antes del primer '_', con las correcciones de prefix_mapping.
+        """
+        index: Dict[str, np.ndarray] = {"General": np.arange(len(types), dtype=np.int32)}
+        if len(types) == 0:
+            return index
+
+        prefixes = pd.Series(types).str.split('_', n=1).str[0].replace(prefix_mapping)
+        codes, uniques = pd.factorize(prefixes)
+
+        # Un único argsort agrupa las posiciones de todas las categorías a la vez
+        order = np.argsort(codes, kind='stable').astype(np.int32)
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+        first = np.count_nonzero(codes < 0)  # Filas sin 'Type' quedan al inicio del orden
+
+        for code, name in enumerate(uniques):
+            # Excluimos nombres vacíos o muy cortos
+            if len(name) > 2 and name != "General":
+                index[name] = order[first + offsets[code]:first + offsets[code + 1]]
+
+        logger.debug(f"Índice de categorías construido: {len(index) - 1} categorías.")
+        return index
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    @property
+    def empty(self) -> bool:
+        return len(self.questions) == 0
+
+    def categories(self) -> List[str]:
+        """Categorías simplificadas presentes en el banco (sin 'General')."""
+        return sorted(c for c in self.category_index if c != "General")
+
+    def positions(self, category: str) -> np.ndarray:
+        """Posiciones de fila de la categoría simplificada ('General' = todas)."""
+        return self.category_index.get(category or "General", np.empty(0, dtype=np.int32))
+
+    def question(self, position: int) -> Question:
+        """Crea el registro de la pregunta en la posición dada (las opciones son la tupla compartida)."""
+        q_type = self.types[position]
+        return Question(
+            type='general_quiz_question',
+            question=self.questions[position],
+            correct_answer=self.correct_answers[position],
+            options=self.options[position],
+            hint=f"Tema: {q_type}",
+        )
+
+    def rows(self, positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Columnas (pregunta, correcta, opciones, tipo) de varias filas en una sola indexación."""
+        return (self.questions[positions], self.correct_answers[positions],
+                self.options[positions], self.types[positions])
+
+    # --- Snapshot binario (evita leer y procesar quiz_questions en cada inicio) ---
+
+    @staticmethod
+    def snapshot_path(db_path: str) -> str:
+        """Ruta del snapshot junto a la DB (futbolmania.db -> futbolmania.questions.snapshot)."""
+        return os.path.splitext(db_path)[0] + SNAPSHOT_SUFFIX
+
+    def save_snapshot(self, path: str, key) -> bool:
+        """
+        Guarda el banco ya procesado (columnas, opciones separadas e índice de categorías).
+        'key' identifica los datos de origen; load_snapshot solo acepta el mismo key.
+        Como los textos están internados, cada string repetido se escribe una sola vez.
+        """
+        payload = {
+            'version': SNAPSHOT_VERSION,
+            'key': key,
+            'questions': self.questions,
+            'correct_answers': self.correct_answers,
+            'options': self.options,
+            'types': self.types,
+            'category_index': self.category_index,
+        }
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)  # Nunca queda un snapshot a medio escribir
+        except OSError as e:
+            logger.warning(f"No se pudo guardar el snapshot de preguntas en {path}: {e}")
+            return False
+        logger.info(f"Snapshot de preguntas guardado ({len(self)} preguntas).")
+        return True
+
+    @classmethod
+    def load_snapshot(cls, path: str, key) -> Optional["QuestionBank"]:
+        """Carga el snapshot si existe y corresponde a 'key' y a SNAPSHOT_VERSION; si no, None."""
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                payload = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Snapshot de preguntas ilegible ({e}); se reconstruye desde la DB.")
+            return None
+
+        if payload.get('version') != SNAPSHOT_VERSION or payload.get('key') != key:
+            logger.info("Snapshot de preguntas desactualizado; se reconstruye desde la DB.")
+            return None
+
+        logger.info(f"Banco de preguntas cargado desde el snapshot ({len(payload['questions'])} preguntas).")
+        return cls(
+            questions=payload['questions'],
+            correct_answers=payload['correct_answers'],
+            options=payload['options'],
+            types=payload['types'],
+            category_index=payload['category_index'],
+        )
@@ -1,15 +1,18 @@
 # logic/quiz_generator.py
 
 import pandas as pd
+import numpy as np
 import random
 import time 
-from typing import Dict, Any, List, Optional
+from typing import Dict, List, Optional
 import logging 
+import threading
 import os 
 
 # Importamos las clases core
 from core.database_manager import DatabaseManager
 from logic.data_analyzer import DataAnalyzer 
+from logic.question_bank import Question, QuestionBank
 
 # ----------------------------------------------------------------------
 # CONFIGURACIÓN DE LOGGING
@@ -19,8 +22,10 @@ logger.setLevel(logging.DEBUG)
 
 class QuizGenerator:
     """
-    Genera preguntas de trivia de fútbol basándose ÚNICAMENTE en preguntas fijas 
-    cargadas desde la base de datos para máxima velocidad y variedad de contenido propio.
+    Genera preguntas de trivia de fútbol. La base es el banco de preguntas fijas cargado
+    desde la base de datos; en el modo 'General' se suman preguntas dinámicas (goleadores,
+    Balón de Oro, rendimiento por liga) a medida que load_dynamic_sources llena sus cachés,
+    en la proporción fijada por DYNAMIC_QUESTION_SHARE.
     """
     
     # Mapeo de prefijos rotos a sus nombres correctos para la UX
@@ -31,85 +36,119 @@ class QuizGenerator:
         'ele': 'Pele',
         'eckenbauer': 'Beckenbauer',
     }
+
+    # Fracción de las preguntas de 'General' que sale de los tipos dinámicos cargados (repartida
+    # en partes iguales entre ellos); el resto sale del banco de preguntas fijas
+    DYNAMIC_QUESTION_SHARE = 0.25
     
-    def __init__(self):
-        self.db = DatabaseManager() 
-        self.analyzer = DataAnalyzer() 
+    def __init__(self, db_manager: Optional[DatabaseManager] = None, analyzer: Optional[DataAnalyzer] = None):
+        # Se reutilizan los servicios compartidos (AppContext); solo se crean si no se reciben
+        self.db = db_manager or DatabaseManager() 
+        self.analyzer = analyzer or DataAnalyzer(db_manager=self.db) 
         self.AVAILABLE_LEAGUES = ['GB1', 'ES1', 'IT1', 'FR1', 'DE1']
 
         self.used_questions: set = set()
 
-        # Carga de Cachés Dinámicos: ESTABLECIDOS COMO VACÍOS (Acelera la inicialización) 
+        # Protege mazos e historial: QuizApp extrae preguntas por adelantado desde el QThreadPool
+        self._draw_lock = threading.RLock()
+
+        # Mazos por categoría: posiciones de fila barajadas y el puntero de la próxima extracción
+        self._rng = np.random.default_rng()
+        self.question_decks: Dict[str, np.ndarray] = {}
+        self.deck_positions: Dict[str, int] = {}
+        # Mazos ya avisados como agotados (el WARNING sale una sola vez por mazo y quiz)
+        self._exhausted_decks: set = set()
+
+        # Carga de Cachés Dinámicos: VACÍOS al iniciar; load_dynamic_sources() los llena en segundo plano
         self.scorers_cache = pd.DataFrame()
         self.ballon_dor_cache = pd.DataFrame()
         self.league_scorers_cache = {}
         self.league_assists_cache = {}
         
-        #  CACHÉ PRINCIPAL: Preguntas Fijas Generales (Es la única que se carga realmente)
-        self.general_questions_cache = self._load_general_questions_cache()
+        #  CACHÉ PRINCIPAL: Preguntas Fijas Generales en formato columnar (Es la única que se carga realmente)
+        self.question_bank = self._load_general_questions_cache()
         
         # Diccionario que mapea nombres de preguntas a sus métodos generadores
         self.question_types = {
             'general_quiz_question': self._generate_general_question, 
+            'top_scorer_question': self._generate_top_scorer_question,
+            'ballon_dor_question': self._generate_ballon_dor_question,
+            'league_scorer_question': self._generate_league_scorer_question,
+            'league_assists_question': self._generate_league_assists_question,
         }
         
-        # Valida qué tipos de preguntas tienen data cargada para usarlos (Solo será 'general_quiz_question')
+        # Valida qué tipos de preguntas tienen data cargada para usarlos (al inicio solo 'general_quiz_question';
+        # los tipos dinámicos se agregan a medida que load_dynamic_sources llena sus cachés)
         self.available_question_types = self._get_available_question_types()
         
         logger.info("QuizGenerator inicializado. Listo para generar preguntas.")
 
     def reset_used_questions(self):
-        """Limpia el historial de preguntas usadas para permitir un nuevo quiz."""
-        self.used_questions.clear()
+        """Limpia el historial de preguntas usadas y descarta los mazos para permitir un nuevo quiz."""
+        with self._draw_lock:
+            self.used_questions.clear()
+            self.question_decks.clear()
+            self.deck_positions.clear()
+            self._exhausted_decks.clear()
         logger.info("Historial de preguntas usadas reseteado.")
 
+    #  MODO MAZO: cada categoría se baraja una vez por quiz y se extrae en O(1)
+    def _category_positions(self, category: str) -> np.ndarray:
+        """Devuelve las posiciones de fila que pertenecen a la categoría simplificada."""
+        return self.question_bank.positions(category)
+
+    def _get_deck(self, category: str) -> np.ndarray:
+        """Devuelve el mazo barajado de la categoría, construyéndolo la primera vez que se pide en el quiz."""
+        deck = self.question_decks.get(category)
+        if deck is None:
+            deck = self._rng.permutation(self._category_positions(category))
+            self.question_decks[category] = deck
+            self.deck_positions[category] = 0
+            logger.debug(f"Mazo creado para '{category}' con {len(deck)} preguntas.")
+        return deck
+
+    def remaining_questions(self, category: str = "General") -> int:
+        """
+        Cantidad de preguntas que quedan por extraer del mazo de la categoría en el quiz actual.
+        No cuenta las que ya salieron por otro mazo (ej. del 'General' durante un fallback).
+        Cuesta O(mazo): es para el chequeo inicial de start_quiz, no para cada extracción.
+        """
+        with self._draw_lock:
+            deck = self._get_deck(category)
+            pending = deck[self.deck_positions[category]:]
+            if not self.used_questions or not len(pending):
+                return len(pending)
+            used = np.isin(self.question_bank.questions[pending], list(self.used_questions))
+            return len(pending) - int(np.count_nonzero(used))
+
     #  Simplificación y Corrección de Nombres
     def get_available_categories(self) -> List[str]:
         """
-        Consulta la tabla 'quiz_questions', corrige prefijos, agrupa por el prefijo
-        y retorna una lista de categorías simplificadas para mostrar al usuario.
+        Retorna la lista de categorías simplificadas (prefijos corregidos) para mostrar 
+        al usuario, leída directamente del índice de categorías del banco.
         """
-        try:
-            # 1. Obtener todas las categorías únicas del caché
-            categories_raw = self.general_questions_cache['Type'].dropna().unique().tolist()
-            categories_raw = [str(c).strip() for c in categories_raw if c]
-            
-            # 2. Simplificar, agrupar y corregir
-            simplified_categories = set()
-            for cat in categories_raw:
-                
-                # Obtener el prefijo (parte antes del primer '_')
-                simplified = cat.split('_')[0]
-                
-                # Aplicar corrección si el prefijo está roto (ej: 'ruyff'  'Cruyff')
-                if simplified in self.PREFIX_MAPPING:
-                    simplified = self.PREFIX_MAPPING[simplified]
-                
-                # Excluimos nombres vacíos o muy cortos
-                if len(simplified) > 2:
-                    simplified_categories.add(simplified)
-            
-            # 3. Formato final y adición de 'General'
-            categories_final = sorted(list(simplified_categories))
-            
-            # Asegurar que 'General' esté siempre en la lista
-            if "General" not in categories_final:
-                categories_final.insert(0, "General")
-            
-            logger.debug(f"Categorías simplificadas disponibles: {categories_final}")
-            return categories_final
-
-        except Exception as e:
-            logger.error(f"Error al obtener categorías simplificadas: {e}")
-            return ["General"] 
+        # Asegurar que 'General' esté siempre en la lista
+        categories_final = ["General"] + self.question_bank.categories()
+        
+        logger.debug(f"Categorías simplificadas disponibles: {categories_final}")
+        return categories_final
 
 
     #  Métodos de Carga de Cachés 
 
-    def _load_general_questions_cache(self) -> pd.DataFrame:
-        """Carga el caché de las preguntas generales fijas desde la DB."""
+    def _load_general_questions_cache(self) -> QuestionBank:
+        """Carga las preguntas generales fijas desde la DB y las convierte al banco columnar."""
         logger.info("Cargando Banco de Preguntas Generales Fijas...")
         TABLE_NAME = "quiz_questions"
+
+        # Si quiz_questions no cambió desde el último inicio, se usa el banco ya procesado
+        snapshot_path = QuestionBank.snapshot_path(self.db.db_path)
+        table_version = self.db.table_version(TABLE_NAME)
+        snapshot_key = (table_version, sorted(self.PREFIX_MAPPING.items()))
+        if table_version:
+            bank = QuestionBank.load_snapshot(snapshot_path, snapshot_key)
+            if bank is not None:
+                return bank
         
         try:
             df = self.db.query(f"SELECT * FROM {TABLE_NAME};") 
@@ -125,24 +164,66 @@ class QuizGenerator:
             df['Type'] = df['Type'].astype(str).str.strip()
             
             logger.info(f"Cargadas {len(df)} preguntas generales.")
-            return df
+            bank = QuestionBank.from_dataframe(df, self.PREFIX_MAPPING)
+            if table_version and not bank.empty:
+                bank.save_snapshot(snapshot_path, snapshot_key)
+            return bank
             
         except Exception as e:
             logger.error(f"Error al cargar/acceder la tabla de preguntas generales ({TABLE_NAME}): {e}")
-            return pd.DataFrame()
+            return QuestionBank.empty_bank()
+
+    #  CARGA DINÁMICA EN SEGUNDO PLANO: el quiz nunca espera por estas fuentes
+    def load_dynamic_sources(self) -> List[str]:
+        """
+        Llena los cachés del DataAnalyzer (goleadores, Balón de Oro, rendimiento por liga)
+        y registra cada tipo de pregunta apenas su caché tiene datos. Pensado para correr en
+        un hilo de trabajo después del primer frame; devuelve los tipos disponibles al final.
+        """
+        sources = [
+            ('top_scorer_question', 'scorers_cache', self._load_scorers_cache),
+            ('ballon_dor_question', 'ballon_dor_cache', self._load_ballon_dor_cache),
+            ('league_scorer_question', 'league_scorers_cache', lambda: self._load_league_performance_cache('goals')),
+            ('league_assists_question', 'league_assists_cache', lambda: self._load_league_performance_cache('assists')),
+        ]
+        for q_type, cache_attr, loader in sources:
+            start_time = time.time()
+            try:
+                cache = loader()
+            except Exception as e:
+                logger.error(f"Error al cargar la fuente de '{q_type}': {e}")
+                continue
+
+            # Cache y registro bajo el mismo lock que usa la extracción de preguntas
+            with self._draw_lock:
+                setattr(self, cache_attr, cache)
+                if len(cache) and q_type not in self.available_question_types:
+                    self.available_question_types.append(q_type)
+            if len(cache):
+                logger.info(f"Tipo de pregunta '{q_type}' disponible ({time.time() - start_time:.2f} s).")
+            else:
+                logger.warning(f"Sin datos para '{q_type}'; el tipo queda desactivado.")
+
+        return list(self.available_question_types)
 
-    # Otros métodos de carga omitidos por ser esqueletos
     def _load_scorers_cache(self) -> pd.DataFrame:
-        logger.debug("Omitting Top Scorers Cache load for speed.")
-        return pd.DataFrame()
+        logger.debug("Cargando caché de máximos goleadores...")
+        return self.analyzer.get_top_scorers()
 
     def _load_ballon_dor_cache(self) -> pd.DataFrame:
-        logger.debug("Omitting Ballon d'Or Cache load for speed.")
-        return pd.DataFrame()
+        logger.debug("Cargando caché de Balón de Oro...")
+        df = self.analyzer.get_ballon_dor_winners()
+        if df.empty:
+            return df
+        # 'Rank' puede venir como número o como texto ("1st"): nos quedamos con el número
+        df = df.assign(Rank=pd.to_numeric(df['Rank'].astype(str).str.extract(r'(\d+)')[0], errors='coerce'))
+        return df.dropna(subset=['Rank'])
 
     def _load_league_performance_cache(self, stat: str) -> Dict[str, pd.DataFrame]:
-        logger.debug(f"Omitting Top {stat.capitalize()} Cache load for speed.")
-        return {}
+        logger.debug(f"Cargando caché de Top {stat.capitalize()} por liga...")
+        # Una sola consulta trae goles y asistencias de todas las ligas; la segunda llamada sale del caché
+        performance = self.analyzer.get_top_performance_by_leagues(self.AVAILABLE_LEAGUES, stats=('goals', 'assists'))
+        return {league_code: df for league_code, df in performance.get(stat, {}).items() if not df.empty}
     # FIN DE FUNCIONES DE CARGA DINÁMICA
 
 
@@ -151,8 +232,8 @@ class QuizGenerator:
         """
         Verifica qué tipos de preguntas tienen datos disponibles.
         """
-        if not self.general_questions_cache.empty:
-            logger.info(f"Usando SOLO preguntas generales fijas ({len(self.general_questions_cache)} disponibles) para mantener la variedad deseada.")
+        if not self.question_bank.empty:
+            logger.info(f"Preguntas generales fijas disponibles: {len(self.question_bank)}. Las fuentes dinámicas se agregan al cargarse.")
             return ['general_quiz_question'] 
         
         logger.error("¡ERROR FATAL! No hay datos disponibles para generar preguntas.")
@@ -173,159 +254,238 @@ class QuizGenerator:
         except Exception as e:
             return []
 
-    #  (Generadores de preguntas específicas omitidos) 
-    def _generate_top_scorer_question(self) -> Optional[Dict[str, Any]]:
-        df = self.scorers_cache
-        if df.empty: return None
-        return None 
+    #  GENERADORES DINÁMICOS (datos del DataAnalyzer)
+    # Nombres de liga para mostrar en las preguntas
+    LEAGUE_NAMES = {
+        'GB1': 'Premier League',
+        'ES1': 'LaLiga',
+        'IT1': 'Serie A',
+        'FR1': 'Ligue 1',
+        'DE1': 'Bundesliga',
+    }
+    # Intentos para encontrar una pregunta dinámica que no se haya usado en el quiz
+    DYNAMIC_ATTEMPTS = 5
 
-    def _generate_ballon_dor_question(self) -> Optional[Dict[str, Any]]:
-        df = self.ballon_dor_cache
-        if df.empty: return None
+    def _generate_stat_question(self, df: pd.DataFrame, value_column: str, template: str,
+                                q_type: str, hint: str) -> Optional[Question]:
+        """
+        Pregunta "¿Quién tiene este valor?": elige un jugador del ranking y usa como
+        distractores a otros jugadores con un valor DISTINTO (para que no haya dos correctas).
+        """
+        if df.empty or len(df) < 2:
+            return None
+        for _ in range(self.DYNAMIC_ATTEMPTS):
+            row = df.iloc[random.randrange(len(df))]
+            question = template.format(value=int(row[value_column]))
+            if question in self.used_questions:
+                continue
+            others = df[df[value_column] != row[value_column]]
+            distractors = self._get_distractors(others, row['Player_Name'], 'Player_Name')
+            if not distractors:
+                continue
+            return Question(
+                type=q_type,
+                question=question,
+                correct_answer=row['Player_Name'],
+                options=distractors + [row['Player_Name']],
+                hint=hint,
+            )
         return None
 
-    def _generate_league_scorer_question(self) -> Optional[Dict[str, Any]]:
-        if not self.league_scorers_cache: return None
-        return None
+    def _generate_top_scorer_question(self, category: str = "General") -> Optional[Question]:
+        return self._generate_stat_question(
+            self.scorers_cache, 'Total_Goals',
+            "¿Qué jugador suma **{value} goles** en todos los partidos registrados?",
+            'top_scorer_question', "Tema: Máximos goleadores",
+        )
 
-    def _generate_league_assists_question(self) -> Optional[Dict[str, Any]]:
-        if not self.league_assists_cache: return None
+    def _generate_ballon_dor_question(self, category: str = "General") -> Optional[Question]:
+        df = self.ballon_dor_cache
+        if df.empty: return None
+        winners = df[df['Rank'] == 1]
+        for _ in range(self.DYNAMIC_ATTEMPTS):
+            if winners.empty:
+                return None
+            winner = winners.iloc[random.randrange(len(winners))]
+            question = f"¿Quién ganó el Balón de Oro **{int(winner['Year'])}**?"
+            if question in self.used_questions:
+                continue
+            # Distractores: primero los nominados de ese año, si no alcanzan, de cualquier año
+            nominees = df[(df['Year'] == winner['Year']) & (df['Player'] != winner['Player'])]
+            distractors = self._get_distractors(nominees, winner['Player'], 'Player')
+            if len(distractors) < 3:
+                extra = self._get_distractors(df[~df['Player'].isin(distractors)], winner['Player'], 'Player',
+                                              num_distractors=3 - len(distractors))
+                distractors += extra
+            if not distractors:
+                continue
+            return Question(
+                type='ballon_dor_question',
+                question=question,
+                correct_answer=winner['Player'],
+                options=distractors + [winner['Player']],
+                hint=f"Club: {winner['Club']}",
+            )
         return None
+
+    def _generate_league_stat_question(self, cache: Dict[str, pd.DataFrame], stat: str, q_type: str) -> Optional[Question]:
+        if not cache: return None
+        league_code = random.choice(list(cache))
+        df = cache[league_code]
+        value_column = f"Total_{stat.capitalize()}"
+        league = self.LEAGUE_NAMES.get(league_code, league_code)
+        season = self.analyzer.season_label(self.analyzer.last_complete_season)
+        stat_text = "goles" if stat == 'goals' else "asistencias"
+        return self._generate_stat_question(
+            df, value_column,
+            f"¿Quién registró **{{value}} {stat_text}** en {league} en la temporada {season}?",
+            q_type, f"Liga: {league}",
+        )
+
+    def _generate_league_scorer_question(self, category: str = "General") -> Optional[Question]:
+        return self._generate_league_stat_question(self.league_scorers_cache, 'goals', 'league_scorer_question')
+
+    def _generate_league_assists_question(self, category: str = "General") -> Optional[Question]:
+        return self._generate_league_stat_question(self.league_assists_cache, 'assists', 'league_assists_question')
         
     #  GENERADOR: Preguntas de conocimiento general 
-    #  Filtrado por Prefijo (incluyendo los corregidos)
-    def _generate_general_question(self, category: str = "General") -> Optional[Dict[str, Any]]:
-        """Genera una pregunta a partir del banco de preguntas fijas, filtrando por el prefijo de categoría."""
+    #  Extracción desde el mazo de la categoría (incluyendo los prefijos corregidos)
+    def _generate_general_question(self, category: str = "General") -> Optional[Question]:
+        """Extrae la próxima pregunta no usada del mazo barajado de la categoría."""
         
-        df = self.general_questions_cache
-        if df.empty: 
+        bank = self.question_bank
+        if bank.empty: 
             logger.warning("El caché de preguntas generales está vacío.")
             return None
 
-        #  FILTRADO CRÍTICO: Usamos el nombre simplificado para buscar todas las subcategorías
-        if category and category != "General":
-            
-            # 1. Determinamos qué prefijos reales buscamos en la columna 'Type' de la DB
-            search_prefixes = [category]
-            
-            # 2. Si la categoría simplificada coincide con un nombre corregido (ej. 'Maradona'),
-            #    también buscamos su versión original rota (ej. 'aradona') en la DB.
-            reverse_mapping = {v: k for k, v in self.PREFIX_MAPPING.items()}
-            if category in reverse_mapping:
-                search_prefixes.append(reverse_mapping[category])
-
-            # 3. Construimos la máscara de filtrado
-            # Busca categorías que comienzan con el prefijo o que son exactamente el prefijo (ej: 'CAN' o 'CAN_Historia')
-            mask = df['Type'].str.startswith(tuple(p + '_' for p in search_prefixes), na=False) | \
-                   (df['Type'].isin(search_prefixes))
-
-            filtered_df = df[mask]
-            
-            if filtered_df.empty:
-                # Si el filtro específico falla, volvemos al DF original para que el fallback general
-                # en get_random_question maneje la búsqueda, evitando el doble filtro aquí.
-                # Devolvemos None aquí si no encontramos nada específico
-                logger.debug(f"No se encontraron preguntas para el prefijo: {category} o subcategoría.")
-                return None
-        else:
-            # Si es General, usa el DF completo
-            filtered_df = df
+        deck = self._get_deck(category)
+        position = self.deck_positions[category]
 
-        # Selecciona una fila del DataFrame filtrado
-        if filtered_df.empty:
-            logger.warning("El DataFrame filtrado quedó vacío. Imposible generar pregunta.")
-            return None
+        # Saltamos preguntas ya usadas (ej. el mazo 'General' tras un fallback desde una categoría)
+        while position < len(deck):
+            row_position = deck[position]
+            position += 1
+            if bank.questions[row_position] in self.used_questions:
+                continue
 
-        question_row = filtered_df.sample(n=1).iloc[0]
-        
-        correct_answer = str(question_row['Correct_Answer']).strip()
-        incorrect_options_text = str(question_row['Options']).strip()
-        incorrect_options = [opt.strip() for opt in incorrect_options_text.split(';') if opt.strip()]
-        question_slug = str(question_row['Question']).strip()
-
-        return {
-            'type': 'general_quiz_question',
-            'question': question_slug,
-            'correct_answer': correct_answer,
-            'options': incorrect_options, 
-            'hint': f"Tema: {str(question_row.get('Type', 'General')).strip()}",
-        }
+            self.deck_positions[category] = position
+            return bank.question(row_position)
+
+        self.deck_positions[category] = position
+        if category in self._exhausted_decks:
+            logger.debug(f"Mazo agotado para la categoría: {category}.")
+        else:
+            self._exhausted_decks.add(category)
+            logger.warning(f"No quedan preguntas en el mazo de '{category}'.")
+        return None
 
 
     # --- Método Principal de Generación (CON LÓGICA DE FALLBACK A 'General') 
-    def get_random_question(self, category: str = "General") -> Optional[Dict[str, Any]]:
+    def get_random_question(self, category: str = "General") -> Optional[Question]:
         """
         Selecciona un tipo de pregunta aleatorio de los disponibles, 
         genera la pregunta y garantiza un formato estándar, filtrando por categoría.
+        Si el mazo de la categoría está agotado se pasa directamente al mazo 'General'.
+        Es seguro llamarlo desde otro hilo (prefetch de QuizApp).
         """
+        with self._draw_lock:
+            return self._draw_question(category)
+
+    def _pick_question_type(self) -> str:
+        """Tipo para una pregunta de 'General' según DYNAMIC_QUESTION_SHARE (el banco fijo si no hay dinámicos)."""
+        dynamic_types = [q_type for q_type in self.available_question_types if q_type != 'general_quiz_question']
+        if not dynamic_types:
+            return 'general_quiz_question'
+        if 'general_quiz_question' in self.available_question_types and random.random() >= self.DYNAMIC_QUESTION_SHARE:
+            return 'general_quiz_question'
+        return random.choice(dynamic_types)
+
+    def _draw_question(self, category: str) -> Optional[Question]:
         if not self.available_question_types:
             logger.error("No hay tipos de preguntas disponibles para generar.")
             return None
 
-        # --------------------------------------------------------
-        # PRIMER INTENTO (Específico): Generar pregunta de la categoría solicitada
-        # --------------------------------------------------------
-        for _ in range(20): 
-            q_type = random.choice(self.available_question_types)
-            generator_func = self.question_types[q_type]
-            
-            # Pasa la categoría específica
-            question_data = generator_func(category=category) 
+        categories_to_try = [category] if category == "General" else [category, "General"]
 
-            if question_data and question_data['question'] not in self.used_questions:
-                logger.debug(f"Pregunta generada (Específica): {q_type} (Categoría: {category})")
-                return self._format_question_data(question_data)
+        for target_category in categories_to_try:
+            # Los tipos dinámicos solo entran en 'General'; una categoría temática usa su propio mazo
+            q_type = self._pick_question_type() if target_category == "General" else 'general_quiz_question'
+            if q_type != 'general_quiz_question':
+                question_data = self.question_types[q_type](category=target_category)
+                if question_data:
+                    logger.debug(f"Pregunta generada: {q_type} (Categoría: {target_category})")
+                    return self._format_question_data(question_data)
+                # Sin pregunta dinámica nueva: se usa el mazo de preguntas fijas
 
-            elif question_data and question_data['question'] in self.used_questions:
-                logger.debug("Pregunta ya usada (Específica), intentando generar otra.")
-            
-            # Si question_data es None, es porque _generate_general_question no encontró 
-            # preguntas para la categoría específica (ej: CAN).
+            # Mazo agotado: _generate_general_question devuelve None y se pasa a 'General'
+            question_data = self._generate_general_question(category=target_category)
 
-        logger.warning(f"Fallo en 20 intentos para la categoría '{category}'. Intentando con 'General'.")
-        
-        # --------------------------------------------------------
-        # SEGUNDO INTENTO (Fallback): Generar pregunta de la categoría 'General'
-        # --------------------------------------------------------
-        if category != "General":
-            for _ in range(20):
-                q_type = random.choice(self.available_question_types)
-                generator_func = self.question_types[q_type]
-                
-                # Pasa la categoría 'General' para el fallback
-                question_data = generator_func(category="General")
-                
-                if question_data and question_data['question'] not in self.used_questions:
-                    logger.debug(f"Pregunta generada (FALLBACK): {q_type} (Categoría: General)")
-                    return self._format_question_data(question_data)
-                
-                elif question_data and question_data['question'] in self.used_questions:
-                    logger.debug("Pregunta ya usada (General), intentando generar otra.")
+            if question_data:
+                logger.debug(f"Pregunta generada: general_quiz_question (Categoría: {target_category})")
+                return self._format_question_data(question_data)
 
-        logger.warning("Fallo al generar una pregunta única después de 40 intentos (Específica + General).")
+        logger.warning(f"No quedan preguntas únicas para '{category}' ni en 'General'.")
         return None 
 
-    def _format_question_data(self, question_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Aplica el formato final, mezcla opciones y registra la pregunta como usada."""
-        correct = question_data['correct_answer']
-        options = question_data.get('options', [])
-        
-        # 1. Asegurar que la respuesta correcta esté en las opciones
+    #  GENERACIÓN POR LOTES: un quiz completo en una sola extracción vectorizada
+    def generate_quiz(self, category: str = "General", n: int = 10, seed: Optional[int] = None) -> List[Question]:
+        """
+        Genera un quiz de N preguntas distintas eligiendo todas las filas en una sola
+        extracción de NumPy. Si la categoría no alcanza, se completa con 'General'.
+        No modifica los mazos ni el historial de preguntas usadas de la sesión.
+        """
+        bank = self.question_bank
+        if bank.empty or n <= 0:
+            return []
+
+        rng = np.random.default_rng(seed)
+        positions = self._category_positions(category)
+        chosen = rng.choice(positions, size=min(n, len(positions)), replace=False)
+
+        if len(chosen) < n and category != "General":
+            rest = np.setdiff1d(self._category_positions("General"), chosen, assume_unique=True)
+            extra = rng.choice(rest, size=min(n - len(chosen), len(rest)), replace=False)
+            chosen = np.concatenate((chosen, extra))
+            logger.warning(f"La categoría '{category}' no alcanza para {n} preguntas; completado con 'General'.")
+
+        # Una sola indexación por columna; las opciones ya vienen separadas desde la carga
+        questions, corrects, options, types = bank.rows(chosen)
+
+        quiz = [
+            Question(
+                type='general_quiz_question',
+                question=question,
+                correct_answer=correct,
+                options=self._select_options(correct, row_options, rng),
+                hint=f"Tema: {q_type}",
+            )
+            for question, correct, row_options, q_type in zip(questions, corrects, options, types)
+        ]
+
+        logger.debug(f"Quiz por lotes generado: {len(quiz)} preguntas (Categoría: {category}).")
+        return quiz
+
+    def _select_options(self, correct: str, options, rng: np.random.Generator) -> List[str]:
+        """Deduplica, asegura la respuesta correcta, recorta a 3 distractores + la correcta y mezcla."""
+        # 1. Deduplicar conservando el orden y asegurar que la respuesta correcta esté
+        options = list(dict.fromkeys(options))
         if correct not in options:
             options.append(correct)
-            
-        final_options = options
-        
+
         # 2. Si hay demasiadas opciones, seleccionar 3 distractores al azar + la correcta
-        if len(final_options) > 4:
+        if len(options) > 4:
             options_without_correct = [o for o in options if o != correct]
-            num_distractors = min(3, len(options_without_correct))
-            distractors = random.sample(options_without_correct, num_distractors)
-            final_options = distractors + [correct]
-            
-        # 3. Mezclar y aplicar
-        random.shuffle(final_options)
-        question_data['options'] = final_options
-        self.used_questions.add(question_data['question'])
+            picked = rng.choice(len(options_without_correct), size=3, replace=False)
+            options = [options_without_correct[i] for i in picked] + [correct]
+
+        # 3. Mezclar
+        return [options[i] for i in rng.permutation(len(options))]
+
+    def _format_question_data(self, question_data: Question) -> Question:
+        """Aplica el formato final, mezcla opciones y registra la pregunta como usada."""
+        question_data.options = self._select_options(
+            question_data.correct_answer, question_data.options, self._rng
+        )
+        self.used_questions.add(question_data.question)
         
-        return question_data
\ No newline at end of file
+        return question_data
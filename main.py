@@ -1,12 +1,14 @@
 # main.py
 
-import os
 import time
+# Referencia para medir el tiempo hasta el primer frame (incluye imports y construcción de la ventana)
+PROCESS_START = time.perf_counter()
+
 import io
 import sys
 import logging
 from PySide6.QtWidgets import QApplication
-from core.database_manager import DatabaseManager
+from core.app_context import AppContext
 from gui.main_window import MainWindow  
 
 # =================================================================
@@ -20,45 +22,15 @@ logger = logging.getLogger(__name__)
 # 2. Corrección de Codificación (UTF-8)
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
-# =================================================================
-# FUNCIÓN DE SETUP DE DATOS (Optimizado para la carga mínima)
-# =================================================================
-
-def setup_data():
-    """
-    Inicializa la base de datos de forma simple, garantizando que
-    los datos de preguntas fijas y la tabla Ranking existan antes de
-    iniciar la GUI.
-    """
-    db_manager = DatabaseManager()
-    
-    # Verificamos si el archivo DB existe antes de cualquier operación
-    db_exists_before = os.path.exists(db_manager.db_path)
-    
-    start_time = time.time() # Inicia el cronómetro
-    
-    # initialize_database() se encarga de:
-    # 1. Cargar las preguntas (si el archivo DB NO existe)
-    # 2. Asegurar que la tabla Ranking exista (SIEMPRE)
-    db_manager.initialize_database()
-
-    end_time = time.time()
-    
-    # Mensaje de retroalimentación
-    if not db_exists_before:
-        logger.info(f"FASE II COMPLETADA: Carga inicial de preguntas fijas tomó {end_time - start_time:.2f} segundos.")
-    else:
-        logger.info("Base de datos ya existente. Saltando la carga inicial de preguntas.")
-    
-    return db_manager 
 # =================================================================
 # PUNTO DE ARRANQUE PRINCIPAL
 # =================================================================
 
 if __name__ == '__main__':
     
-    # 1. Garantizar que la DB y los datos mínimos estén listos
-    setup_data() 
+    # 1. Servicios compartidos. La carga/refresco de los CSV NO se hace aquí: corre en el
+    #    QThreadPool tras el primer frame (AppContext.warm_up), con el menú ya en pantalla
+    app_context = AppContext()
     
     # 2.  INICIAMOS LA APLICACIÓN GRÁFICA
     logger.info("Iniciando la aplicación Fútbolmanía...")
@@ -68,7 +40,8 @@ if __name__ == '__main__':
         app = QApplication(sys.argv)
         
         # B. Crear la ventana principal (que contiene toda la navegación)
-        main_window = MainWindow()
+        # Recibe el contexto: prepara la DB y el banco de preguntas en segundo plano
+        main_window = MainWindow(context=app_context, started_at=PROCESS_START)
         main_window.show()
         
         # C. Ejecutar el bucle de eventos de la aplicación